@@ -0,0 +1,90 @@
+"""
+Compare language detection throughput: langdetect.detect per message
+(what `translate` used to do) against LanguageDetector.detect_many.
+Every message is distinct, so the engine's cold pass measures detection
+alone; the warm pass re-runs the same messages to show the cache on its own.
+
+    python benchmarks/langdetect_bench.py [messages]
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langdetect import detect
+from core.language import LanguageDetector
+
+SAMPLES = [
+    "Hello everyone, how are you doing today?",
+    "Hola a todos, ¿cómo están hoy?",
+    "Bonjour à tous, comment allez-vous aujourd'hui ?",
+    "Hallo zusammen, wie geht es euch heute?",
+    "Ciao a tutti, come state oggi?",
+    "Olá a todos, como vocês estão hoje?",
+    "Всем привет, как у вас дела сегодня?",
+    "みなさん、こんにちは。今日はお元気ですか？",
+    "Merhaba millet, bugün nasılsınız?",
+    "Hej allihopa, hur mår ni idag?",
+    "gg",
+    "lol that was insane",
+    "Please read the rules before posting in this channel.",
+    "Por favor lee las reglas antes de publicar en este canal.",
+]
+
+
+def corpus(size):
+    """Distinct chat-like messages: a sample phrase plus unique trailing words."""
+    rng = random.Random(0)
+    words = [word for sample in SAMPLES for word in sample.split()]
+    return [f"{rng.choice(SAMPLES)} {' '.join(rng.sample(words, 3))} {i}" for i in range(size)]
+
+
+def bench_per_message(messages):
+    started = time.perf_counter()
+    for text in messages:
+        try:
+            detect(text)
+        except Exception:
+            pass
+    return time.perf_counter() - started
+
+
+async def bench_engine(messages, batch_size=50):
+    """(warm-up, cold pass, warm pass) timings; the warm pass is all cache hits."""
+    detector = LanguageDetector(cache_size=len(messages))
+    started = time.perf_counter()
+    await detector.warm_up()
+    warm_up = time.perf_counter() - started
+    passes = []
+    for _ in range(2):
+        started = time.perf_counter()
+        for i in range(0, len(messages), batch_size):
+            await detector.detect_many(messages[i:i + batch_size])
+        passes.append(time.perf_counter() - started)
+    return warm_up, passes[0], passes[1]
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    messages = corpus(size)
+
+    # First call pays for loading profiles, as the first `translate` after startup did
+    started = time.perf_counter()
+    detect(SAMPLES[0])
+    cold = time.perf_counter() - started
+    per_message = bench_per_message(messages)
+    warm_up, cold_pass, warm_pass = asyncio.run(bench_engine(messages))
+
+    print(f"messages:              {size}")
+    print(f"langdetect cold start: {cold * 1000:.0f} ms (on the caller)")
+    print(f"engine warm-up:        {warm_up * 1000:.0f} ms (in the background)")
+    print(f"detect() per message:  {per_message:.2f} s  ({size / per_message:,.0f} msg/s)")
+    print(f"detect_many, cold:     {cold_pass:.2f} s  ({size / cold_pass:,.0f} msg/s, no cache hits)")
+    print(f"detect_many, warm:     {warm_pass:.2f} s  ({size / warm_pass:,.0f} msg/s, all cache hits)")
+
+
+if __name__ == "__main__":
+    main()
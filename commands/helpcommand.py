@@ -16,8 +16,9 @@ INVITE = os.getenv("INVITE_LINK") or ""
 CATEGORIES = {
     "Owner": [
         ("off", "Shuts the bot down."),
-        ("server", "Server count and names. Subcommands: `count`, `names`."),
+        ("server", "Server count and names. Subcommands: `count`, `names`, `export`."),
         ("uptime", "Display the bot's uptime."),
+        ("storage", "Storage queue depth and per-call latency."),
     ],
     "Moderation": [
         ("ban", "Ban a user from the server. Sends a DM."),
@@ -26,12 +27,13 @@ CATEGORIES = {
         ("unmute", "Unmute a previously muted user."),
         ("warn", "Warn a user. Auto-mute after max warns."),
         ("setmaxwarns", "Set the maximum warns before auto-mute."),
+        ("warnings", "Show recent warns in this server or for a user."),
         ("silentban", "Ban a user without notifying them."),
         ("unban", "Unban a user by ID."),
-        ("voice", "Voice channel management. Subcommands: mute, unmute, kick, deafen, undeafen, move."),
+        ("voice", "Voice channel management. Subcommands: mute, unmute, kick, deafen, undeafen, move, all."),
         ("nick", "Change a member's nickname."),
-        ("role", "Role management. Subcommands: `give`, `remove`."),
-        ("clear", "Delete messages. Subcommands: bot, human, user; or use with amount."),
+        ("role", "Role management. Subcommands: `give`, `remove`, `mass`, `jobs`, `cancel`."),
+        ("clear", "Delete messages. Subcommands: bot, human, user, match, attachments, links, between, channels; or use with amount."),
     ],
     "Utility": [
         ("avatar", "Display a user's or server's avatar/banner. Aliases: av."),
@@ -39,10 +41,11 @@ CATEGORIES = {
         ("prefix", "Set this server's command prefix. Aliases: p."),
         ("firstmsg", "Jump to the first message in this channel."),
         ("info", "Info subcommands: role, user, server."),
-        ("listing", "List subcommands: admins, mods, norole, role, roles, channels, bots, bans, recent."),
+        ("listing", "List subcommands: admins, mods, norole, role, roles, channels, bots, bans, recent, export."),
         ("mc", "Member count in this server."),
         ("timer", "Countdown timer. Alias: t."),
         ("translate", "Translate text to English."),
+        ("autotranslate", "Auto-translate a channel. Subcommands: `on`, `off`. Aliases: at."),
         ("join", "Connect the bot to your voice channel."),
         ("leave", "Disconnect the bot from voice."),
         ("vcc", "Count users in a voice channel by ID."),
@@ -204,11 +207,18 @@ def _help_warn(ctx, prefix, avatar_url):
 
 def _help_setmaxwarns(ctx, prefix, avatar_url):
     e = _custom_embed_base(ctx, "Moderation", prefix, avatar_url)
-    e.add_field(name="", value="> Set how many warns before auto-mute.", inline=False)
+    e.add_field(name="", value="> Set how many warns before auto-mute in this server.", inline=False)
     e.add_field(name="Usage", value=f"`{prefix}setmaxwarns <number>`", inline=False)
     return e
 
 
+def _help_warnings(ctx, prefix, avatar_url):
+    e = _custom_embed_base(ctx, "Moderation", prefix, avatar_url)
+    e.add_field(name="", value="> Show the last 10 warns in this server, or for one user.", inline=False)
+    e.add_field(name="Usage", value=f"`{prefix}warnings [user]`", inline=False)
+    return e
+
+
 def _help_voice(ctx, prefix, avatar_url):
     e = _custom_embed_base(ctx, "Moderation", prefix, avatar_url)
     e.add_field(name="", value="> Voice channel management.", inline=False)
@@ -218,7 +228,8 @@ def _help_voice(ctx, prefix, avatar_url):
         f"`{prefix}voice kick <user>` – Kick from VC\n"
         f"`{prefix}voice deafen <user>` – Deafen\n"
         f"`{prefix}voice undeafen <user>` – Undeafen\n"
-        f"`{prefix}voice move <user>` – Move users to another channel"
+        f"`{prefix}voice move <channel> [from channel]` – Move everyone to another channel\n"
+        f"`{prefix}voice all <mute|unmute|deafen|undeafen|disconnect> [channel]` – Apply to everyone in a channel"
     ), inline=False)
     return e
 
@@ -235,7 +246,9 @@ def _help_role(ctx, prefix, avatar_url):
     e.add_field(name="", value="> Give or remove roles.", inline=False)
     e.add_field(name="Usage", value=(
         f"`{prefix}role give <user> <role> [role...]`\n"
-        f"`{prefix}role remove <user> <role> [role...]`"
+        f"`{prefix}role remove <user> <role> [role...]`\n"
+        f"`{prefix}role mass <give|remove> <role> <role|humans>` – apply to many members\n"
+        f"`{prefix}role jobs` / `{prefix}role cancel <id>` – running mass jobs"
     ), inline=False)
     return e
 
@@ -247,7 +260,12 @@ def _help_clear(ctx, prefix, avatar_url):
         f"`{prefix}clear <amount>` – delete that many messages\n"
         f"`{prefix}clear bot [amount]` – delete bot messages\n"
         f"`{prefix}clear human [amount]` – delete user messages\n"
-        f"`{prefix}clear user <user> [amount]` – delete messages from a user"
+        f"`{prefix}clear user <user> [amount]` – delete messages from a user\n"
+        f"`{prefix}clear match <regex> [amount]` – delete messages matching a pattern\n"
+        f"`{prefix}clear attachments [amount]` – delete messages with files\n"
+        f"`{prefix}clear links [amount]` – delete messages with links\n"
+        f"`{prefix}clear between <YYYY-MM-DD> <YYYY-MM-DD> [amount]` – delete messages in a date range\n"
+        f"`{prefix}clear channels <amount> <#channel...>` – purge several channels at once"
     ), inline=False)
     return e
 
@@ -261,6 +279,7 @@ _CUSTOM_HELP = {
     "unmute": _help_unmute,
     "warn": _help_warn,
     "setmaxwarns": _help_setmaxwarns,
+    "warnings": _help_warnings,
     "voice": _help_voice,
     "nick": _help_nick,
     "role": _help_role,
@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
 from discord.ui import Button, View
+from core import ban_cache
 
 def create_embed(title, description, color):
     embed = discord.Embed(title=title, description=description, color=color)
@@ -13,6 +14,7 @@ async def ban(ctx, user: discord.Member, *, reason=None):
     
     # Ban the user first
     await ctx.guild.ban(user, reason=reason)
+    ban_cache.add(ctx.guild.id, user)
 
     # Embed to confirm the ban and ask for notification choice
     embed = create_embed(
@@ -1,5 +1,26 @@
+import re
+import datetime
 import discord
 from discord.ext import commands
+from core.purge import Progress, build_check, purge_channel, purge_channels
+
+async def _run_purge(ctx, amount, check=None, after=None, before=None, label="messages"):
+    """Purge ctx.channel before the command message, editing one progress message as it goes."""
+    if amount <= 0:
+        await ctx.send("Amount must be greater than 0.", delete_after=5)
+        return
+    status = await ctx.send("Purging…")
+    progress = Progress(status)
+    try:
+        deleted, _ = await purge_channel(ctx.channel, amount, check, before=before or ctx.message, after=after, progress=progress)
+    except discord.Forbidden:
+        await status.edit(content="I don't have permission to delete messages here.", delete_after=5)
+        return
+    try:
+        await ctx.message.delete()
+    except discord.HTTPException:
+        pass
+    await status.edit(content=f"Cleared {deleted} {label}.", delete_after=5)
 
 @commands.group(name='clear', aliases=['purge', 'clean'], invoke_without_command=True)
 @commands.has_permissions(manage_messages=True)
@@ -9,37 +30,84 @@ async def clear(ctx, amount: int = None):
         await ctx.send("Please specify how many messages to delete. Example: `.clear 10`", delete_after=5)
         return
 
-    if amount <= 0:
-        await ctx.send("Amount must be greater than 0.", delete_after=5)
-        return
-
-    deleted = await ctx.channel.purge(limit=amount + 1)
-    await ctx.send(f"Cleared {len(deleted) - 1} messages.", delete_after=5)
+    await _run_purge(ctx, amount)
 
 @clear.command(name='bot')
 @commands.has_permissions(manage_messages=True)
 async def clear_bot(ctx, amount: int = 50):
     """Clears messages sent by bots."""
-    limit = min(max(1, amount), 100) + 1
-    deleted = await ctx.channel.purge(limit=limit, check=lambda m: m.author.bot, before=ctx.message)
-    await ctx.send(f"Cleared {len(deleted)} bot messages.", delete_after=5)
+    await _run_purge(ctx, amount, build_check(bots=True), label="bot messages")
 
 @clear.command(name='human')
 @commands.has_permissions(manage_messages=True)
 async def clear_human(ctx, amount: int = 10):
     """Clears messages sent by human users."""
-    limit = min(max(1, amount), 100) + 1
-    deleted = await ctx.channel.purge(limit=limit, check=lambda m: not m.author.bot, before=ctx.message)
-    await ctx.send(f"Cleared {len(deleted)} human messages.", delete_after=5)
+    await _run_purge(ctx, amount, build_check(bots=False), label="human messages")
 
 @clear.command(name='user')
 @commands.has_permissions(manage_messages=True)
 async def clear_user(ctx, user: discord.User, amount: int = 10):
     """Clears messages from a specific user (mention or ID)."""
-    limit = min(max(1, amount), 100) + 1
-    deleted = await ctx.channel.purge(limit=limit, check=lambda m: m.author.id == user.id, before=ctx.message)
-    await ctx.send(f"Cleared {len(deleted)} messages from {user.mention}.", delete_after=5)
+    await _run_purge(ctx, amount, build_check(author=user), label=f"messages from {user.mention}")
+
+@clear.command(name='match')
+@commands.has_permissions(manage_messages=True)
+async def clear_match(ctx, pattern: str, amount: int = 50):
+    """Clears messages whose content matches a regular expression."""
+    try:
+        compiled = re.compile(pattern, re.IGNORECASE)
+    except re.error as e:
+        await ctx.send(f"Invalid pattern: {e}", delete_after=5)
+        return
+    await _run_purge(ctx, amount, build_check(pattern=compiled), label="matching messages")
+
+@clear.command(name='attachments', aliases=['files'])
+@commands.has_permissions(manage_messages=True)
+async def clear_attachments(ctx, amount: int = 50):
+    """Clears messages with attachments."""
+    await _run_purge(ctx, amount, build_check(attachments=True), label="messages with attachments")
+
+@clear.command(name='links')
+@commands.has_permissions(manage_messages=True)
+async def clear_links(ctx, amount: int = 50):
+    """Clears messages containing links."""
+    await _run_purge(ctx, amount, build_check(links=True), label="messages with links")
+
+@clear.command(name='between')
+@commands.has_permissions(manage_messages=True)
+async def clear_between(ctx, start: str, end: str, amount: int = 100):
+    """Clears messages sent between two dates (YYYY-MM-DD, end date inclusive)."""
+    try:
+        after = datetime.datetime.strptime(start, "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc)
+        before = datetime.datetime.strptime(end, "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc) + datetime.timedelta(days=1)
+    except ValueError:
+        await ctx.send("Dates must look like `2024-01-31`.", delete_after=5)
+        return
+    before = min(before, ctx.message.created_at)
+    await _run_purge(ctx, amount, after=after, before=before, label="messages")
+
+@clear.command(name='channels')
+@commands.has_permissions(manage_messages=True)
+async def clear_channels(ctx, amount: int, *channels: discord.TextChannel):
+    """Clears recent messages from several channels in parallel."""
+    if amount <= 0 or not channels:
+        await ctx.send("Usage: `clear channels <amount> <#channel> [#channel...]`", delete_after=5)
+        return
+    # has_permissions only covers ctx.channel; Manage Messages can be granted per channel
+    denied = [channel for channel in channels if not channel.permissions_for(ctx.author).manage_messages]
+    if denied:
+        await ctx.send(f"You don't have Manage Messages in {', '.join(channel.mention for channel in denied)}.", delete_after=10)
+        return
+    status = await ctx.send("Purging…")
+    results = await purge_channels(list(channels), amount, progress=Progress(status), before=ctx.message.created_at)
+    lines = []
+    for channel, result in results.items():
+        if isinstance(result, Exception):
+            lines.append(f"{channel.mention}: failed ({result})")
+        else:
+            lines.append(f"{channel.mention}: {result} deleted")
+    await status.edit(content="\n".join(lines), delete_after=15)
 
 
 async def setup(bot):
-    bot.add_command(clear)
\ No newline at end of file
+    bot.add_command(clear)
@@ -1,6 +1,7 @@
+import time
 import discord
 from discord.ext import commands
-import asyncio
+from core.mute_role import get_mute_role
 
 TIME_UNITS = {
     "s": 1,
@@ -12,12 +13,8 @@ TIME_UNITS = {
 @commands.command(description="Mute a user for a specified duration.")
 @commands.has_permissions(manage_roles=True)
 async def mute(ctx, user: discord.Member, duration: str = None):
-    mute_role = discord.utils.get(ctx.guild.roles, name="Muted")
-    
-    if not mute_role:
-        mute_role = await ctx.guild.create_role(name="Muted", reason="Creating Muted role for muting users.")
-        for channel in ctx.guild.channels:
-            await channel.set_permissions(mute_role, send_messages=False)
+    # Creates the role on first use; channel overwrites roll out in the background
+    mute_role = await get_mute_role(ctx.guild, create=True)
 
     if mute_role in user.roles:
         await ctx.send("User is already muted.")
@@ -37,12 +34,37 @@ async def mute(ctx, user: discord.Member, duration: str = None):
         time_in_seconds = time_value * TIME_UNITS[time_unit]
 
         await user.add_roles(mute_role, reason=f"Muted for {duration} by {ctx.author.name}.")
+        # The scheduler survives restarts; unmute cancels this job
+        await ctx.bot.scheduler.schedule(
+            "unmute", mute_job_id(ctx.guild.id, user.id), time.time() + time_in_seconds,
+            ctx.guild.id, user_id=user.id, role_id=mute_role.id, duration=duration
+        )
         await ctx.send(f"{user.mention} has been muted for {duration}.")
 
-        await asyncio.sleep(time_in_seconds)
-        if mute_role in user.roles:
-            await user.remove_roles(mute_role, reason=f"Unmuted automatically after {duration}.")
+
+def mute_job_id(guild_id, user_id):
+    return f"unmute:{guild_id}:{user_id}"
+
+
+async def expire_mute(bot, job):
+    """Scheduler handler: lift a timed mute."""
+    guild = bot.get_guild(job["guild_id"])
+    if guild is None:
+        return
+    data = job["data"]
+    mute_role = guild.get_role(data["role_id"])
+    if mute_role is None:
+        return
+    member = guild.get_member(data["user_id"])
+    if member is None:
+        try:
+            member = await guild.fetch_member(data["user_id"])
+        except discord.NotFound:
+            return
+    if mute_role in member.roles:
+        await member.remove_roles(mute_role, reason=f"Unmuted automatically after {data['duration']}.")
 
 
 async def setup(bot):
-    bot.add_command(mute)
\ No newline at end of file
+    bot.add_command(mute)
+    bot.scheduler.register("unmute", expire_mute)
\ No newline at end of file
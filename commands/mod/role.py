@@ -1,5 +1,6 @@
 import discord
 from discord.ext import commands
+from core.role_jobs import edit_roles, describe
 
 @commands.group(name='role', invoke_without_command=True, description="Manages roles for members in a server.")
 @commands.has_permissions(manage_roles=True)
@@ -8,17 +9,16 @@ async def role(ctx):
         embed = discord.Embed(title="User Roles Management", description="Available subcommands:", color=discord.Color.blue())
         embed.add_field(name="Give", value="Gives one or more roles to the mentioned user.", inline=False)
         embed.add_field(name="Remove", value="Removes one or more roles from the mentioned user.", inline=False)
+        embed.add_field(name="Mass", value="Gives or removes a role for everyone with another role, or all humans.", inline=False)
+        embed.add_field(name="Jobs", value="Shows running mass role jobs.", inline=False)
+        embed.add_field(name="Cancel", value="Cancels a running mass role job.", inline=False)
         await ctx.send(embed=embed)
 
 
 @role.command(name="give", description='Gives one or more roles to the mentioned user.')
 async def give_role(ctx, member: discord.Member, *roles: discord.Role):
-    given_roles = []
-    
-    for role in roles:
-        if role not in member.roles:
-            await member.add_roles(role)
-            given_roles.append(role.mention)
+    added, _ = await edit_roles(member, add=roles, reason=f"Given by {ctx.author}")
+    given_roles = [role.mention for role in added]
 
     if given_roles:
         roles_mention = ", ".join(given_roles)
@@ -39,12 +39,8 @@ async def give_role(ctx, member: discord.Member, *roles: discord.Role):
 
 @role.command(name="remove", description='Removes one or more roles from the mentioned user.')
 async def remove_role(ctx, member: discord.Member, *roles: discord.Role):
-    removed_roles = []
-
-    for role in roles:
-        if role in member.roles:
-            await member.remove_roles(role)
-            removed_roles.append(role.mention)
+    _, removed = await edit_roles(member, remove=roles, reason=f"Removed by {ctx.author}")
+    removed_roles = [role.mention for role in removed]
 
     if removed_roles:
         roles_mention = ", ".join(removed_roles)
@@ -63,5 +59,43 @@ async def remove_role(ctx, member: discord.Member, *roles: discord.Role):
         await ctx.send(embed=embed)
 
 
+@role.command(name="mass", description='Gives or removes a role for everyone with another role, or for all humans.')
+async def mass_role(ctx, action: str, role: discord.Role, source: str):
+    action = action.lower()
+    if action not in ("give", "remove"):
+        await ctx.send("Action must be `give` or `remove`.")
+        return
+    if role >= ctx.guild.me.top_role or role.managed:
+        await ctx.send(f"I can't manage {role.mention}.")
+        return
+    if role >= ctx.author.top_role and ctx.author != ctx.guild.owner:
+        await ctx.send(f"{role.mention} is not below your top role.")
+        return
+    if source.lower() == "humans":
+        source = "humans"
+    else:
+        try:
+            source = await commands.RoleConverter().convert(ctx, source)
+        except commands.RoleNotFound:
+            await ctx.send("Source must be a role or `humans`.")
+            return
+    await ctx.bot.role_jobs.submit(ctx.guild, ctx.channel, ctx.author, action, role, source)
+
+
+@role.command(name="jobs", description='Shows running mass role jobs.')
+async def role_jobs(ctx):
+    jobs = ctx.bot.role_jobs.running(ctx.guild.id)
+    description = "\n".join(describe(job) for job in jobs) or "No mass role jobs are running."
+    await ctx.send(embed=discord.Embed(title="Mass Role Jobs", description=description, color=discord.Color.blue()))
+
+
+@role.command(name="cancel", description='Cancels a running mass role job.')
+async def cancel_job(ctx, job_id: str):
+    if await ctx.bot.role_jobs.cancel(ctx.guild.id, job_id):
+        await ctx.message.add_reaction('✅')
+    else:
+        await ctx.send(f"No running job `{job_id}`.")
+
+
 async def setup(bot):
     bot.add_command(role)
\ No newline at end of file
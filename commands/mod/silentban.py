@@ -1,11 +1,13 @@
 import discord
 from discord.ext import commands
+from core import ban_cache
 
 @commands.command(description="Ban a user from the server without sending any notification.")
 @commands.has_permissions(ban_members=True)
 async def silentban(ctx, user: discord.User):
     try:
         await ctx.guild.ban(user, delete_message_days=0)
+        ban_cache.add(ctx.guild.id, user)
         embed = discord.Embed(title="Silent Ban User", description=f"{user.name} has been silently banned from the server.", color=discord.Color.green())
         await ctx.send(embed=embed)
     except discord.NotFound:
@@ -1,11 +1,13 @@
 import discord
 from discord.ext import commands
+from core import ban_cache
 
 @commands.command(description="Unban a user from the server.")
 @commands.has_permissions(ban_members=True)
 async def unban(ctx, user: discord.User):
     try:
         await ctx.guild.unban(user)
+        ban_cache.remove(ctx.guild.id, user.id)
         embed = discord.Embed(title="Unban User", description=f"{user.name} has been unbanned from the server.", color=discord.Color.green())
         await ctx.send(embed=embed)
     except discord.NotFound:
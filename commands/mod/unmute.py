@@ -1,10 +1,14 @@
 import discord
 from discord.ext import commands
+from core.mute_role import get_mute_role
+from commands.mod.mute import mute_job_id
 
 @commands.command(description="Unmute a previously muted user.")
 @commands.has_permissions(manage_roles=True)
 async def unmute(ctx, user: discord.Member):
-    mute_role = discord.utils.get(ctx.guild.roles, name="Muted")
+    # Drop any pending expiry first, even if the role was already removed by hand
+    await ctx.bot.scheduler.cancel(mute_job_id(ctx.guild.id, user.id))
+    mute_role = await get_mute_role(ctx.guild)
     
     if not mute_role or mute_role not in user.roles:
         await ctx.send("User is not muted.")
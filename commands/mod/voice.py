@@ -1,5 +1,6 @@
 import discord
 from discord.ext import commands
+from core import voice_ops
 
 def is_admin():
     async def predicate(ctx):
@@ -15,7 +16,8 @@ async def voice(ctx):
     embed.add_field(name="Kick", value="Kick a user from a voice channel.", inline=False)
     embed.add_field(name="Deafen", value="Deafen a user in a voice channel.", inline=False)
     embed.add_field(name="Undeafen", value="Undeafen a user in a voice channel.", inline=False)
-    embed.add_field(name="Move", value="Move a user to a different voice channel.", inline=False)
+    embed.add_field(name="Move", value="Move everyone in a voice channel to another one.", inline=False)
+    embed.add_field(name="All", value="Mute, unmute, deafen, undeafen or disconnect everyone in a voice channel.", inline=False)
     await ctx.send(embed=embed)
 
 @voice.command(name='mute', description="Mute a user in a voice channel.")
@@ -80,25 +82,38 @@ async def join_author_vc(ctx):
         channel = ctx.author.voice.channel
         await ctx.bot.join_voice_channel(channel)
 
-async def move_all_members(ctx, new_channel):
-    if ctx.author.voice and ctx.author.voice.channel:
+async def move_all_members(ctx, new_channel, old_channel=None):
+    if old_channel is None and ctx.author.voice and ctx.author.voice.channel:
         old_channel = ctx.author.voice.channel
-        for member in old_channel.members:
-            await member.move_to(new_channel)
+    if old_channel is None:
+        return None
+    return await voice_ops.run(ctx.guild, list(old_channel.members), "move", new_channel, reason=f"Moved by {ctx.author}")
 
-@voice.command(name='move', description="Move a user to the bot's voice channel.")
+@voice.command(name='move', description="Move everyone from a voice channel (default: yours) to another.")
 @is_admin()
-async def move(ctx, target_channel: discord.VoiceChannel):
-    if not ctx.author.voice or not ctx.author.voice.channel:
-        await ctx.send('You must be in a voice channel to use this command.')
+async def move(ctx, target_channel: discord.VoiceChannel | discord.StageChannel, source_channel: discord.VoiceChannel | discord.StageChannel = None):
+    source_channel = source_channel or (ctx.author.voice.channel if ctx.author.voice else None)
+    if source_channel is None:
+        await ctx.send('You must be in a voice channel or name a source channel to use this command.')
         return
 
-    members = ctx.author.voice.channel.members
+    summary = await move_all_members(ctx, target_channel, source_channel)
+    await ctx.send(f'{voice_ops.describe(summary, "Moved")} from {source_channel.mention} to {target_channel.mention}.')
 
-    for member in members:
-        await member.move_to(target_channel)
-    await ctx.send(f'Successfully moved all users from {ctx.author.voice.channel.mention} to {target_channel.mention}.')
+@voice.command(name='all', description="Apply mute/unmute/deafen/undeafen/disconnect to everyone in a voice channel.")
+@is_admin()
+async def all_members(ctx, action: str, channel: discord.VoiceChannel | discord.StageChannel = None):
+    action = action.lower()
+    if action not in voice_ops.OPERATIONS or action == "move":
+        await ctx.send(f":x: Action must be one of: {', '.join(op for op in voice_ops.OPERATIONS if op != 'move')}.")
+        return
+    channel = channel or (ctx.author.voice.channel if ctx.author.voice else None)
+    if channel is None:
+        await ctx.send('You must be in a voice channel or name one to use this command.')
+        return
 
+    summary = await voice_ops.run(ctx.guild, list(channel.members), action, reason=f"{action} all by {ctx.author}")
+    await ctx.send(f'{voice_ops.describe(summary, voice_ops.PAST_TENSE[action])} in {channel.mention}.')
 
 async def setup(bot):
     bot.add_command(voice)
\ No newline at end of file
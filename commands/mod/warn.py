@@ -1,8 +1,9 @@
 import discord
 from discord.ext import commands
+from db.settings import get_setting, set_setting
+from db.warnings import add_warn, reset_warns, warn_history
 
-warn_count = {}
-max_warns = 3
+DEFAULT_MAX_WARNS = 3
 
 @commands.command(description="Warn a user. Mute the user if warns exceed the maximum allowed warns.")
 @commands.has_permissions(manage_roles=True)
@@ -11,30 +12,55 @@ async def warn(ctx, user: discord.Member, *, reason=None):
         await ctx.send("You can't warn a bot.")
         return
 
-    if user.id not in warn_count:
-        warn_count[user.id] = 1
-    else:
-        warn_count[user.id] += 1
+    count = await add_warn(ctx.guild.id, user.id, ctx.author.id, reason)
+    max_warns = await get_setting(ctx.guild.id, 'max_warns', DEFAULT_MAX_WARNS)
 
-    if user.id in max_warns and warn_count[user.id] > max_warns[user.id]:
-        await ctx.invoke(ctx.bot.get_command('mute'), user=user, time="1h")
-        warn_count[user.id] = 0
+    if count > max_warns:
+        await ctx.invoke(ctx.bot.get_command('mute'), user=user, duration="1h")
+        await reset_warns(ctx.guild.id, user.id)
     else:
-        await ctx.send(f"{user.mention} has been warned. Warn count: {warn_count[user.id]}")
+        await ctx.send(f"{user.mention} has been warned. Warn count: {count}")
 
 
-@commands.command(description="Set the maximum allowed warns for all users.")
+@commands.command(description="Set the maximum allowed warns for this server.")
 @commands.has_permissions(manage_guild=True)
 async def setmaxwarns(ctx, limit: int):
-    global max_warns
     if limit < 1:
         await ctx.send("The maximum allowed warns must be at least 1.")
         return
 
-    max_warns = limit
-    await ctx.send(f"The maximum allowed warns for all users has been set to {limit}.")
+    try:
+        await set_setting(ctx.guild.id, 'max_warns', limit)
+    except Exception as e:
+        print(f"Error saving max warns for guild {ctx.guild.id}: {e}")
+        await ctx.send("Could not save the maximum warns. Please try again.")
+        return
+    await ctx.send(f"The maximum allowed warns for this server has been set to {limit}.")
+
+
+@commands.command(name='warnings', description="Show recent warns in this server, or for one user.")
+@commands.has_permissions(manage_roles=True)
+async def warnings(ctx, user: discord.Member = None):
+    try:
+        events = await warn_history(ctx.guild.id, user.id if user else None, limit=10)
+    except Exception as e:
+        print(f"Error loading warn history: {e}")
+        await ctx.send("Could not load warnings. Please try again.")
+        return
+
+    title = f"Warnings for {user.display_name}" if user else "Recent warnings"
+    if not events:
+        await ctx.send(embed=discord.Embed(description="No warnings found.", color=discord.Color.green()))
+        return
+
+    lines = []
+    for event in events:
+        target = "" if user else f"<@{event['user_id']}> "
+        lines.append(f"{target}<t:{int(event['created_at'])}:R> by <@{event['moderator_id']}>: {event.get('reason') or 'No reason provided.'}")
+    await ctx.send(embed=discord.Embed(title=title, description="\n".join(lines), color=discord.Color.orange()))
 
 
 async def setup(bot):
     bot.add_command(warn)
-    bot.add_command(setmaxwarns)
\ No newline at end of file
+    bot.add_command(setmaxwarns)
+    bot.add_command(warnings)
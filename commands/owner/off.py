@@ -1,6 +1,7 @@
 import discord
 import asyncio
 from discord.ext import commands
+from db.write_behind import write_buffer
 
 @commands.command(name='off', description='OWNER ONLY: Shuts the bot down.')
 @commands.is_owner()
@@ -25,6 +26,8 @@ async def off(ctx):
     except discord.NotFound:
         pass
 
+    # Flush pending settings writes before the connection goes away
+    await write_buffer.drain()
     print(f'{ctx.bot.user.name}#{ctx.bot.user.discriminator} turned off.')
     await ctx.bot.close()
 
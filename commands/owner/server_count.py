@@ -1,5 +1,9 @@
 import discord
 from discord.ext import commands
+from core import cluster
+from core import counters
+from core.paginator import send_pages
+from core.export import send_export
 
 @commands.group(invoke_without_command=True)
 @commands.is_owner()
@@ -10,17 +14,31 @@ async def server(ctx):
 
 @server.command(description="Display the number of servers the bot is in.")
 async def count(ctx):
-    total_members = 0
-    for guild in ctx.bot.guilds:
-        total_members += sum(1 for member in guild.members if not member.bot)
-    guild_count = len(ctx.bot.guilds)
-    await ctx.send(embed=discord.Embed(title='Server Count', description=f"I am currently monitoring `{total_members} members` (excluding bots) in `{guild_count} servers`.", color=discord.Color.blue()))
+    counters.estimate_all(ctx.bot.guilds)
+    totals = await cluster.combined_stats(ctx.bot)
+    total_members = totals['humans']
+    guild_count = totals['guilds']
+    embed = discord.Embed(title='Server Count', description=f"I am currently monitoring `{total_members} members` (excluding bots) in `{guild_count} servers`.", color=discord.Color.blue())
+    footer = []
+    if cluster.CLUSTER_ID is not None:
+        footer.append(f"Across {totals['clusters']} clusters • this is cluster {cluster.CLUSTER_ID}")
+    approximate = counters.approximate_guilds()
+    if approximate:
+        # Lean intents: these guilds aren't chunked, so bots are only subtracted where cached
+        footer.append(f"Human count is approximate for {approximate} servers here")
+    if footer:
+        embed.set_footer(text=" • ".join(footer))
+    await ctx.send(embed=embed)
 
 @server.command(description="Display the names of servers the bot is in.")
 async def names(ctx):
-    server_names = [guild.name for guild in ctx.bot.guilds]
-    formatted_names = "\n".join(server_names)
-    await ctx.send(embed=discord.Embed(title='Server Names', description=f"```{formatted_names}```", color=discord.Color.blue()))
+    await send_pages(ctx, (guild.name for guild in ctx.bot.guilds), 'Server Names', empty_message="I'm not in any servers.")
+
+
+@server.command(name='export', description="Export every server the bot is in as a CSV/JSONL file.")
+async def export(ctx, *options):
+    rows = ((guild.id, guild.name, guild.member_count, guild.owner_id) for guild in list(ctx.bot.guilds))
+    await send_export(ctx, rows, ("id", "name", "member_count", "owner_id"), "servers", options)
 
 
 async def setup(bot):
@@ -0,0 +1,31 @@
+import discord
+from discord.ext import commands
+from db.database import storage_stats
+from core.translation import translation_cache
+
+@commands.command(name='storage', description='OWNER ONLY: Shows storage queue depth and per-call latency.')
+@commands.is_owner()
+async def storage(ctx):
+    stats = storage_stats()
+    embed = discord.Embed(title=':floppy_disk: Storage', description=f"Queue depth: `{stats['queue_depth']}` • Workers: `{stats['workers']}`", color=discord.Color.blue())
+    for op, s in sorted(stats['ops'].items()):
+        embed.add_field(
+            name=op,
+            value=f"calls `{s['calls']}` • errors `{s['errors']}`\navg `{s['avg_ms']:.1f}ms` • max `{s['max_ms']:.1f}ms` • wait `{s['avg_wait_ms']:.1f}ms`",
+            inline=False
+        )
+    cache = ctx.bot.custom_prefixes
+    embed.add_field(name="Prefix cache", value=f"`{len(cache)}` guilds • hits `{cache.hits}` • misses `{cache.misses}`", inline=False)
+    t = translation_cache.summary()
+    embed.add_field(
+        name="Translation cache",
+        value=f"`{t['entries']}` entries • hit ratio `{t['hit_ratio']:.0%}` • saved `{t['saved_ms'] / 1000:.1f}s` of upstream calls (avg `{t['avg_upstream_ms']:.0f}ms`)",
+        inline=False
+    )
+    if not stats['ops']:
+        embed.add_field(name="No calls yet", value="Nothing has hit the database since startup.", inline=False)
+    await ctx.send(embed=embed)
+
+
+async def setup(bot):
+    bot.add_command(storage)
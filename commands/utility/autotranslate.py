@@ -0,0 +1,38 @@
+import discord
+from discord.ext import commands
+from core import autotranslate as engine
+
+@commands.group(name='autotranslate', aliases=['at'], invoke_without_command=True, description="Automatically translate non-English messages in a channel.")
+@commands.has_permissions(manage_channels=True)
+async def autotranslate(ctx):
+    channels = await engine.guild_channels(ctx.guild.id)
+    mentions = "\n".join(f"<#{channel_id}>" for channel_id in channels) or "None"
+    embed = discord.Embed(title="Auto-translate", description=f"Enabled channels:\n{mentions}", color=discord.Color.blue())
+    embed.set_footer(text=f"Use `{ctx.prefix}autotranslate on [channel]` or `{ctx.prefix}autotranslate off [channel]`.")
+    await ctx.send(embed=embed)
+
+@autotranslate.command(name='on', description="Turn auto-translate on for a channel.")
+async def autotranslate_on(ctx, channel: discord.TextChannel = None):
+    channel = channel or ctx.channel
+    try:
+        await engine.set_enabled(ctx.guild.id, channel.id, True)
+    except Exception as e:
+        print(f"Error updating auto-translate for channel {channel.id}: {e}")
+        await ctx.send("Could not update auto-translate. Please try again.")
+        return
+    await ctx.send(embed=discord.Embed(description=f"Auto-translate is now on in {channel.mention}.", color=discord.Color.green()))
+
+@autotranslate.command(name='off', description="Turn auto-translate off for a channel.")
+async def autotranslate_off(ctx, channel: discord.TextChannel = None):
+    channel = channel or ctx.channel
+    try:
+        await engine.set_enabled(ctx.guild.id, channel.id, False)
+    except Exception as e:
+        print(f"Error updating auto-translate for channel {channel.id}: {e}")
+        await ctx.send("Could not update auto-translate. Please try again.")
+        return
+    await ctx.send(embed=discord.Embed(description=f"Auto-translate is now off in {channel.mention}.", color=discord.Color.green()))
+
+
+async def setup(bot):
+    bot.add_command(autotranslate)
@@ -1,17 +1,15 @@
 import discord
 from discord.ext import commands
+from core import first_message
 
 @commands.command(name='firstmsg', description='Takes the user to the very first message of a channel.')
 async def firstmsg(ctx):
-    channel = ctx.channel
-    async for message in channel.history(limit=1, oldest_first=True):
-        first_message = message
-        break
-    else:
+    url = await first_message.jump_url(ctx.channel)
+    if url is None:
         await ctx.send("No messages found in this channel.")
         return
 
-    button = discord.ui.Button(style=discord.ButtonStyle.url, label="Go to First Message", url=first_message.jump_url)
+    button = discord.ui.Button(style=discord.ButtonStyle.url, label="Go to First Message", url=url)
     view = discord.ui.View()
     view.add_item(button)
 
@@ -1,5 +1,7 @@
 import discord
 from discord.ext import commands
+from core.intents import ensure_members
+from core import ban_cache
 
 @commands.group(invoke_without_command=True)
 async def info(ctx):
@@ -9,6 +11,7 @@ async def info(ctx):
 
 @info.command(name='role', description='Gives info about a role.')
 async def info_role(ctx, *, role: discord.Role):
+    await ensure_members(ctx.guild)
     embed = discord.Embed(title=f'Information for {role.name} role', color=role.color)
     embed.add_field(name='ID', value=role.id, inline=False)
     embed.add_field(name='Created At', value=role.created_at.strftime('%Y-%m-%d | %H:%M:%S'), inline=False)
@@ -79,7 +82,7 @@ async def server(ctx):
     embed.set_author(name=f"{guild.name}'s Information", icon_url=ctx.bot.user.avatar.url)
     embed.set_footer(text=f'Requested by {ctx.message.author.name} • {ctx.message.created_at.strftime("%Y-%m-%d | %H:%M:%S")}', icon_url=ctx.author.display_avatar)
 
-    bans_list = [entry.user async for entry in ctx.guild.bans()]
+    bans_list = await ban_cache.get_bans(ctx.guild)
     embed.add_field(name="\n\n__About__", value=f'**Name:** {guild.name}\n**ID:** {guild.id}\n**Owner:crown::** {guild.owner.mention}\n**Created:** {guild.created_at.strftime("%Y-%m-%d | %H:%M:%S")}\n**Members:** {guild.member_count}\n**Banned:** {len(bans_list)}', inline=False)
     
     embed.add_field(name="\n\n__Description__", value=f'> {guild.description}', inline=False)
@@ -1,6 +1,9 @@
 import discord
 import asyncio
 from discord.ext import commands
+from core import member_index, ban_cache, recent_messages
+from core.paginator import send_pages
+from core.export import send_export
 
 @commands.group(invoke_without_command=True)
 async def listing(ctx):
@@ -11,90 +14,54 @@ async def listing(ctx):
 
 @listing.command(name='admins', description="List all administrators.")
 async def list_admins(ctx):
-    admins_list = [f"{member.name} ({member.mention})" for member in ctx.guild.members if not member.bot and member.guild_permissions.administrator]
-    if admins_list:
-        embed = discord.Embed(title='Admins', description='\n'.join(admins_list), color=discord.Colour.blue())
-        await ctx.send(embed=embed)
-    else:
-        embed = discord.Embed(description='No admins found', color=discord.Colour.red())
-        await ctx.send(embed=embed)
+    index = await member_index.get_index(ctx.guild)
+    admins = member_index.resolve(ctx.guild, index.admins)
+    await send_pages(ctx, (f"{member.name} ({member.mention})" for member in admins), 'Admins', empty_message='No admins found')
 
 @listing.command(name='mods', description="List all moderators.")
 async def list_mods(ctx):
-    mods_list = [f"{member.name} ({member.mention})" for member in ctx.guild.members if not member.bot and any(permission in member.guild_permissions for permission in [
-        discord.Permissions.manage_guild,
-        discord.Permissions.manage_channels,
-        discord.Permissions.manage_roles,
-        discord.Permissions.manage_messages
-    ])]
-    if mods_list:
-        embed = discord.Embed(title='Mods', description='\n'.join(mods_list), color=discord.Colour.blue())
-        await ctx.send(embed=embed)
-    else:
-        embed = discord.Embed(description='No moderators found', color=discord.Colour.red())
-        await ctx.send(embed=embed)
+    index = await member_index.get_index(ctx.guild)
+    mods = member_index.resolve(ctx.guild, index.mods)
+    await send_pages(ctx, (f"{member.name} ({member.mention})" for member in mods), 'Mods', empty_message='No moderators found')
 
 @listing.command(name='norole', description="List all members without any roles.")
 async def list_norole(ctx):
-    norole_list = [f"{member.display_name} ({member.mention})" for member in ctx.guild.members if not member.bot and len(member.roles) == 1]
-    if norole_list:
-        embed = discord.Embed(title='No Role', description='\n'.join(norole_list), color=discord.Colour.red())
-        await ctx.send(embed=embed)
-    else:
-        embed = discord.Embed(description='No members found without roles.', color=discord.Colour.green())
-        await ctx.send(embed=embed)
+    index = await member_index.get_index(ctx.guild)
+    norole = member_index.resolve(ctx.guild, index.norole)
+    await send_pages(ctx, (f"{member.display_name} ({member.mention})" for member in norole), 'No Role',
+                     color=discord.Colour.red(), empty_message='No members found without roles.')
 
 @listing.command(name='role', description="List members with a specific role.")
 async def list_role(ctx, role_id: int):
-    role = discord.utils.get(ctx.guild.roles, id=role_id)
+    role = ctx.guild.get_role(role_id)
     if role is None:
         await ctx.send("Role not found.")
         return
 
-    role_list = [f"{member.display_name} ({member.mention})" for member in ctx.guild.members if role in member.roles]
-    if role_list:
-        embed = discord.Embed(title=f'Members with {role.name} role', description='\n'.join(role_list), color=role.color)
-        await ctx.send(embed=embed)
-    else:
-        embed = discord.Embed(description=f"No members found with {role.name} role.", color=discord.Colour.red())
-        await ctx.send(embed=embed)
+    index = await member_index.get_index(ctx.guild)
+    members = member_index.resolve(ctx.guild, index.roles.get(role.id, ()))
+    await send_pages(ctx, (f"{member.display_name} ({member.mention})" for member in members), f'Members with {role.name} role',
+                     color=role.color, empty_message=f"No members found with {role.name} role.")
 
 @listing.command(name='roles', description="List all roles in the server.")
 async def list_roles(ctx):
-    allroles_list = [role.name for role in ctx.guild.roles]
-    if allroles_list:
-        embed = discord.Embed(title='All Roles', description='\n'.join(allroles_list), color=discord.Color.blue())
-        await ctx.send(embed=embed)
-    else:
-        embed = discord.Embed(description="No roles found in this server.", color=discord.Colour.red())
-        await ctx.send(embed=embed)
+    await send_pages(ctx, (role.name for role in ctx.guild.roles), 'All Roles', empty_message="No roles found in this server.")
 
 @listing.command(name='channels', description="List all channels in the server.")
 async def list_channels(ctx):
-    channel_names = [ch.name for ch in ctx.guild.channels]
-    if channel_names:
-        embed = discord.Embed(title='All Channels', description='\n'.join(channel_names), color=discord.Color.blue())
-        await ctx.send(embed=embed)
-    else:
-        embed = discord.Embed(description="No channels found in this server.", color=discord.Colour.red())
-        await ctx.send(embed=embed)
+    await send_pages(ctx, (ch.name for ch in ctx.guild.channels), 'All Channels', empty_message="No channels found in this server.")
 
 @listing.command(name='bots', description="List all bots in the server.")
 async def list_bots(ctx):
-    bots_list = [f"{member.display_name} ({member.mention})" for member in ctx.guild.members if member.bot]
-    if bots_list:
-        embed = discord.Embed(title='Bots', description='\n'.join(bots_list), color=discord.Colour.blue())
-        await ctx.send(embed=embed)
-    else:
-        embed = discord.Embed(description='No bots found', color=discord.Colour.red())
-        await ctx.send(embed=embed)
+    index = await member_index.get_index(ctx.guild)
+    bots = member_index.resolve(ctx.guild, index.bots)
+    await send_pages(ctx, (f"{member.display_name} ({member.mention})" for member in bots), 'Bots', empty_message='No bots found')
 
 @listing.command(name='bans', description="List all banned members in the server with their mentions.")
 async def list_bans(ctx):
-    banned_members = [entry.user async for entry in ctx.guild.bans()]
-    embed = discord.Embed(title="Ban Count", description=f"There are {len(banned_members)} users banned in this server.")
-    embed.add_field(name="Banned Members", value="\n".join([f"{banned_member.name} `ID: {banned_member.id}`" for banned_member in banned_members]))
-    await ctx.send(embed=embed)
+    banned_members = await ban_cache.get_bans(ctx.guild)
+    await send_pages(ctx, (f"{banned_member.name} `ID: {banned_member.id}`" for banned_member in banned_members.values()),
+                     f"Banned Members ({len(banned_members)})", empty_message="There are 0 users banned in this server.")
 
 @listing.command(name='recent', description="List last 15 messages of the specified user.")
 async def list_recent(ctx, user_id: int):
@@ -104,14 +71,11 @@ async def list_recent(ctx, user_id: int):
         await ctx.send("User not found.")
         return
 
-    user_messages = []
-    async for message in ctx.channel.history(limit=100):  # Increase the limit if needed
-        if message.author.id == user.id:
-            user_messages.append(f"{message.content} - {message.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
+    user_messages = [f"{content} - {created_at.strftime('%Y-%m-%d %H:%M:%S')}"
+                     for content, created_at in await recent_messages.recent(ctx.channel, user.id)]
 
     if user_messages:
-        user_messages.reverse()
-        messages_str = "\n".join(user_messages[:15])  # Display only the last 15 messages
+        messages_str = "\n".join(user_messages[-15:])  # Display only the last 15 messages
         display = getattr(user, "global_name", None) or user.name
         embed = discord.Embed(title=f"Last 15 Messages of {display}", description=messages_str, color=discord.Colour.blue())
         await ctx.send(embed=embed)
@@ -119,5 +83,46 @@ async def list_recent(ctx, user_id: int):
         display = getattr(user, "global_name", None) or user.name
         await ctx.send(f"No recent messages found for {display}.")
 
+@listing.group(name='export', invoke_without_command=True, description="Export a complete listing as a CSV/JSONL file.")
+@commands.has_permissions(manage_guild=True)
+async def list_export(ctx):
+    available_subcommands = [c.name for c in list_export.commands]
+    embed = discord.Embed(title='Available subcommands for `listing export`', description="\n".join(available_subcommands), color=discord.Colour.blue())
+    embed.set_footer(text="Options: csv (default), jsonl, gz")
+    await ctx.send(embed=embed)
+
+MEMBER_COLUMNS = ("id", "name", "display_name", "joined_at", "bot")
+
+def _member_rows(guild, member_ids):
+    for member_id in member_ids:
+        member = guild.get_member(member_id)
+        if member is not None:
+            yield (member.id, member.name, member.display_name, member.joined_at.isoformat() if member.joined_at else "", member.bot)
+
+@list_export.command(name='role', description="Export members with a specific role.")
+async def export_role(ctx, role_id: int, *options):
+    role = ctx.guild.get_role(role_id)
+    if role is None:
+        await ctx.send("Role not found.")
+        return
+    index = await member_index.get_index(ctx.guild)
+    await send_export(ctx, _member_rows(ctx.guild, list(index.roles.get(role.id, ()))), MEMBER_COLUMNS, f"role-{role.id}", options)
+
+@list_export.command(name='bots', description="Export all bots in the server.")
+async def export_bots(ctx, *options):
+    index = await member_index.get_index(ctx.guild)
+    await send_export(ctx, _member_rows(ctx.guild, list(index.bots)), MEMBER_COLUMNS, "bots", options)
+
+@list_export.command(name='bans', description="Export all banned users.")
+async def export_bans(ctx, *options):
+    bans = await ban_cache.get_bans(ctx.guild)
+    rows = ((user.id, user.name) for user in list(bans.values()))
+    await send_export(ctx, rows, ("id", "name"), "bans", options)
+
+@list_export.command(name='channels', description="Export all channels in the server.")
+async def export_channels(ctx, *options):
+    rows = ((ch.id, ch.name, str(ch.type), ch.category.name if ch.category else "", ch.position) for ch in ctx.guild.channels)
+    await send_export(ctx, rows, ("id", "name", "type", "category", "position"), "channels", options)
+
 async def setup(bot):
     bot.add_command(listing)
\ No newline at end of file
@@ -17,10 +17,11 @@ async def botPrefix(ctx, prefix: str):
     print(f"Changing prefix for guild {guild_id} to '{prefix}'")
     
     # Save to MongoDB
-    if save_prefix(guild_id, prefix):
+    if await save_prefix(guild_id, prefix):
         # Update both the module-level and bot's custom_prefixes dictionaries
         custom_prefixes[guild_id] = prefix
         ctx.bot.custom_prefixes[guild_id] = prefix
+        await ctx.bot.invalidation_bus.publish("prefix", guild_id, prefix)
 
         embed = discord.Embed(
             title='Prefix changed',
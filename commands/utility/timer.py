@@ -1,5 +1,6 @@
-import asyncio, re, discord
+import re, time, discord
 from discord.ext import commands
+from core.timers import timer_engine, format_remaining
 
 @commands.command(aliases=['t'], description='Starts a countdown timer for the time specified.')
 async def timer(ctx, duration: str):
@@ -18,20 +19,13 @@ async def timer(ctx, duration: str):
         elif unit == 'h':
             total_seconds += int(amount) * 3600
 
-    remaining_seconds = total_seconds
+    deadline = time.time() + total_seconds
     embed = discord.Embed(title=":alarm_clock:Timer", color=discord.Color.blue())
-    embed.add_field(name="Time Remaining:", value=f"{remaining_seconds} seconds")
+    embed.add_field(name="Time Remaining:", value=format_remaining(total_seconds))
 
     message = await ctx.send(embed=embed)
-    await ctx.defer()
-
-    while remaining_seconds > 0:
-        await asyncio.sleep(5)
-        remaining_seconds -= 5
-        embed.set_field_at(0, name="Time Remaining", value=f"{remaining_seconds} seconds")
-        await message.edit(embed=embed)
-
-    await ctx.send(f"{ctx.author.mention}, your timer has ended!", delete_after=10)
+    # The shared engine edits the countdown and mentions the author at the deadline
+    timer_engine.add(message, embed, ctx.author.mention, deadline)
 
 
 async def setup(bot):
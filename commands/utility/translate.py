@@ -1,17 +1,16 @@
+import asyncio
 import discord
 from discord.ext import commands
-from deep_translator import GoogleTranslator
-from langdetect import detect
 import langcodes
+from core.translation import translator
 
 @commands.command(description="Translate a message to English.")
 async def translate(ctx, *, message: str):
     try:
-        language_code = detect(message)
-        
-        language = langcodes.Language.get(language_code).display_name()
-
-        translated = GoogleTranslator(source='auto', target='en').translate(message)
-        await ctx.send(embed=discord.Embed(title=f"Translation ({language})", description=translated))
+        result = await translator.translate(message, 'en')
+        language = langcodes.Language.get(result["source"]).display_name()
+        await ctx.send(embed=discord.Embed(title=f"Translation ({language})", description=result["text"]))
+    except asyncio.TimeoutError:
+        await ctx.send("Translation timed out. Please try again.")
     except Exception as e:
         await ctx.send(f"Translation failed.\n```{e}```")
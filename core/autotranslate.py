@@ -0,0 +1,111 @@
+"""
+Auto-translate mode for busy international channels.
+Messages in enabled channels are language-checked as they arrive (English is
+skipped), collected for AUTOTRANSLATE_WINDOW seconds, translated with one
+batched upstream call, and posted back as a single embed.
+"""
+import os
+import asyncio
+import discord
+import langcodes
+from db.database import get_db, run_db
+from db.settings import SETTINGS_COLLECTION, get_setting, set_setting
+from core.translation import translator
+from core.language import language_detector
+
+AUTOTRANSLATE_WINDOW = float(os.getenv("AUTOTRANSLATE_WINDOW", "3"))
+AUTOTRANSLATE_MAX_BATCH = int(os.getenv("AUTOTRANSLATE_MAX_BATCH", "10"))
+MIN_LENGTH = 4
+MAX_EMBED_CHARS = 4000
+
+_channels = set()
+_buffers = {}   # channel id -> [(message, language)]
+_timers = {}
+
+
+def is_enabled(channel_id):
+    return channel_id in _channels
+
+
+async def load_channels():
+    """Read every enabled channel once at startup, so on_message never waits on MongoDB."""
+    def find():
+        cursor = get_db()[SETTINGS_COLLECTION].find(
+            {'autotranslate_channels': {'$exists': True, '$ne': []}}, {'autotranslate_channels': 1}
+        )
+        return [channel_id for document in cursor for channel_id in document['autotranslate_channels']]
+    try:
+        _channels.update(await run_db("load_autotranslate", find))
+        print(f"Auto-translate enabled in {len(_channels)} channels")
+    except Exception as e:
+        print(f"Error loading auto-translate channels: {e}")
+
+
+async def set_enabled(guild_id, channel_id, enabled):
+    """Raises if the guild's settings can't be read, rather than overwrite the list from a blank one."""
+    channels = set(await get_setting(guild_id, 'autotranslate_channels', [], strict=True))
+    if enabled:
+        channels.add(channel_id)
+        _channels.add(channel_id)
+    else:
+        channels.discard(channel_id)
+        _channels.discard(channel_id)
+    await set_setting(guild_id, 'autotranslate_channels', sorted(channels))
+
+
+async def guild_channels(guild_id):
+    return await get_setting(guild_id, 'autotranslate_channels', [])
+
+
+async def feed(message):
+    """Consider a message from an enabled channel for the next batch."""
+    text = message.content.strip()
+    if len(text) < MIN_LENGTH or not any(ch.isalpha() for ch in text):
+        return
+    # Detect before enqueueing so English chatter never takes a batch slot
+    try:
+        language = await language_detector.detect(text)
+    except Exception:
+        return
+    if language in ("en", "und"):
+        return
+    buffer = _buffers.setdefault(message.channel.id, [])
+    buffer.append((message, language))
+    if len(buffer) >= AUTOTRANSLATE_MAX_BATCH:
+        _flush_now(message.channel)
+    elif message.channel.id not in _timers:
+        _timers[message.channel.id] = asyncio.get_running_loop().call_later(AUTOTRANSLATE_WINDOW, _flush_now, message.channel)
+
+
+def _flush_now(channel):
+    timer = _timers.pop(channel.id, None)
+    if timer is not None:
+        timer.cancel()
+    batch = _buffers.pop(channel.id, [])
+    if batch:
+        asyncio.create_task(_translate_batch(channel, batch))
+
+
+async def _translate_batch(channel, batch):
+    texts = [message.content for message, _ in batch]
+    try:
+        results = await translator.translate_many(texts, 'en', sources=[language for _, language in batch])
+    except Exception as e:
+        print(f"Auto-translate failed in channel {channel.id}: {e}")
+        return
+
+    lines, size = [], 0
+    for (message, language), result in zip(batch, results):
+        if not result["text"] or result["text"].strip() == message.content.strip():
+            continue
+        name = langcodes.Language.get(language).display_name()
+        line = f"**{message.author.display_name}** ({name}): {result['text']}"
+        if size + len(line) + 1 > MAX_EMBED_CHARS:
+            break
+        lines.append(line)
+        size += len(line) + 1
+    if lines:
+        try:
+            await channel.send(embed=discord.Embed(title="Translations", description="\n".join(lines), color=discord.Color.blue()))
+        except discord.HTTPException as e:
+            print(f"Could not post translations in channel {channel.id}: {e}")
@@ -0,0 +1,92 @@
+"""
+Per-guild ban list cache.
+Filled from the REST ban list the first time a guild's bans are needed, then
+kept current from on_member_ban/on_member_unban and the ban commands. Dropped
+when the bot loses Ban Members in that guild, since events stop arriving.
+"""
+import asyncio
+
+_bans = {}    # guild id -> {user id: discord.User}
+_locks = {}
+_filling = {}  # guild id -> [(user id, user or None)] seen while the ban list is being read
+
+
+async def get_bans(guild):
+    """{user id: user} of everyone banned in the guild. Only the first call hits the API."""
+    bans = _bans.get(guild.id)
+    if bans is not None:
+        return bans
+    lock = _locks.setdefault(guild.id, asyncio.Lock())
+    async with lock:
+        if guild.id not in _bans:
+            events = _filling[guild.id] = []
+            try:
+                bans = {entry.user.id: entry.user async for entry in guild.bans(limit=None)}
+            finally:
+                _filling.pop(guild.id, None)
+            # Bans and unbans that arrived mid-read may or may not be in the list; replay them
+            for user_id, user in events:
+                if user is None:
+                    bans.pop(user_id, None)
+                else:
+                    bans[user_id] = user
+            _bans[guild.id] = bans
+    _locks.pop(guild.id, None)
+    return _bans[guild.id]
+
+
+def add(guild_id, user):
+    if guild_id in _filling:
+        _filling[guild_id].append((user.id, user))
+    bans = _bans.get(guild_id)
+    if bans is not None:
+        bans[user.id] = user
+
+
+def remove(guild_id, user_id):
+    if guild_id in _filling:
+        _filling[guild_id].append((user_id, None))
+    bans = _bans.get(guild_id)
+    if bans is not None:
+        bans.pop(user_id, None)
+
+
+def invalidate(guild_id):
+    _bans.pop(guild_id, None)
+
+
+def _check_permission(guild):
+    if guild.me is not None and not guild.me.guild_permissions.ban_members:
+        invalidate(guild.id)
+
+
+async def on_member_ban(guild, user):
+    add(guild.id, user)
+
+
+async def on_member_unban(guild, user):
+    remove(guild.id, user.id)
+
+
+async def on_member_update(before, after):
+    if after.guild.id in _bans and after.guild.me is not None and after.id == after.guild.me.id:
+        _check_permission(after.guild)
+
+
+async def on_guild_role_update(before, after):
+    if after.guild.id in _bans:
+        _check_permission(after.guild)
+
+
+async def on_guild_role_delete(role):
+    if role.guild.id in _bans:
+        _check_permission(role.guild)
+
+
+async def on_guild_remove(guild):
+    invalidate(guild.id)
+
+
+def register(bot):
+    for listener in (on_member_ban, on_member_unban, on_member_update, on_guild_role_update, on_guild_role_delete, on_guild_remove):
+        bot.add_listener(listener, listener.__name__)
@@ -0,0 +1,106 @@
+"""
+Shard/cluster settings for a bot process and the per-process stats file.
+A worker started by launcher.py gets SHARD_COUNT, SHARD_IDS and CLUSTER_ID in
+its environment. Each worker writes its stats to CLUSTER_STATS_DIR so the
+launcher and the owner commands can report totals for the whole cluster.
+"""
+import os
+import json
+import time
+import asyncio
+import tempfile
+from core import counters
+
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0")) or None
+SHARD_IDS = [int(i) for i in os.getenv("SHARD_IDS", "").split(",") if i.strip()] or None
+CLUSTER_ID = os.getenv("CLUSTER_ID")
+CLUSTER_STATS_DIR = os.getenv("CLUSTER_STATS_DIR", os.path.join("data", "cluster"))
+STATS_INTERVAL = float(os.getenv("CLUSTER_STATS_INTERVAL", "30"))
+
+
+def is_sharded():
+    return SHARD_COUNT is not None or os.getenv("AUTOSHARD", "").strip() in ("1", "true", "yes")
+
+
+def shard_ranges(shard_count, workers):
+    """Split shard ids 0..shard_count-1 into `workers` contiguous ranges."""
+    workers = max(1, min(workers, shard_count))
+    size, extra = divmod(shard_count, workers)
+    ranges, start = [], 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+async def local_stats(bot):
+    """Stats for this process, from the live counters."""
+    humans = counters.totals["humans"]
+    return {
+        "cluster": CLUSTER_ID,
+        "pid": os.getpid(),
+        "shards": SHARD_IDS or [],
+        "guilds": len(bot.guilds),
+        "humans": humans,
+        "latency_ms": round(bot.latency * 1000, 2) if bot.latency == bot.latency else None,
+        "updated_at": time.time(),
+    }
+
+
+def write_stats(stats, directory=CLUSTER_STATS_DIR):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{stats['cluster']}.json")
+    fd, tmp_path = tempfile.mkstemp(prefix=".stats-", dir=directory)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(stats, f)
+    os.replace(tmp_path, path)
+
+
+def read_stats(directory=CLUSTER_STATS_DIR, max_age=STATS_INTERVAL * 3):
+    """Stats of every cluster that reported recently, keyed by cluster id."""
+    stats = {}
+    now = time.time()
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return stats
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if now - data.get("updated_at", 0) <= max_age:
+            stats[data["cluster"]] = data
+    return stats
+
+
+async def combined_stats(bot):
+    """Totals across the cluster: live numbers for this process, reported ones for the rest."""
+    own = await local_stats(bot)
+    totals = {"guilds": own["guilds"], "humans": own["humans"], "clusters": 1}
+    if CLUSTER_ID is None:
+        return totals
+    for cluster, data in read_stats().items():
+        if cluster == CLUSTER_ID:
+            continue
+        totals["guilds"] += data["guilds"]
+        totals["humans"] += data["humans"]
+        totals["clusters"] += 1
+    return totals
+
+
+async def publish_stats(bot):
+    """Background task: rewrite this worker's stats file every STATS_INTERVAL seconds."""
+    await bot.wait_until_ready()
+    loop = asyncio.get_running_loop()
+    while not bot.is_closed():
+        try:
+            stats = await local_stats(bot)
+            await loop.run_in_executor(None, write_stats, stats)
+        except Exception as e:
+            print(f"Could not publish cluster stats: {e}")
+        await asyncio.sleep(STATS_INTERVAL)
@@ -0,0 +1,107 @@
+"""
+Live human/bot counters, per guild and across every guild this process serves.
+A guild is counted once and then kept current from join and leave events, so
+`mc` and `server count` never walk member lists. Chunked guilds are counted
+exactly. Others start from the gateway's member_count, with only cached bots
+split out, so the lean intents profile never has to chunk every guild; `mc`
+chunks its own guild when it needs the exact split.
+"""
+from core.intents import ensure_members
+
+_guilds = {}   # guild id -> [humans, bots]
+_approximate = set()
+totals = {"humans": 0, "bots": 0}
+
+
+def _set(guild_id, humans, bots):
+    old = _guilds.get(guild_id, (0, 0))
+    _guilds[guild_id] = [humans, bots]
+    totals["humans"] += humans - old[0]
+    totals["bots"] += bots - old[1]
+
+
+def seed(guild):
+    """Count a chunked guild's members exactly, replacing an estimate."""
+    if (guild.id in _guilds and guild.id not in _approximate) or not guild.chunked:
+        return
+    bots = sum(1 for member in guild.members if member.bot)
+    _set(guild.id, len(guild.members) - bots, bots)
+    _approximate.discard(guild.id)
+
+
+def estimate(guild):
+    """Count a guild without chunking: member_count, minus whichever bots are cached."""
+    if guild.id in _guilds:
+        return
+    if guild.chunked:
+        seed(guild)
+        return
+    total = guild.member_count or getattr(guild, "approximate_member_count", None) or 0
+    bots = sum(1 for member in guild.members if member.bot)
+    _set(guild.id, max(total - bots, 0), bots)
+    _approximate.add(guild.id)
+
+
+def is_counted(guild):
+    return guild.id in _guilds
+
+
+async def guild_counts(guild):
+    """Exact (humans, bots) for a guild, chunking it the first time it's asked for."""
+    if guild.id not in _guilds or guild.id in _approximate:
+        await ensure_members(guild)
+        seed(guild)
+    humans, bots = _guilds.get(guild.id, (0, 0))
+    return humans, bots
+
+
+def counted_guilds():
+    return len(_guilds)
+
+
+def approximate_guilds():
+    return len(_approximate)
+
+
+def estimate_all(guilds):
+    """Count every guild not counted yet, without chunking any of them."""
+    for guild in guilds:
+        estimate(guild)
+
+
+def _adjust(member, delta):
+    counts = _guilds.get(member.guild.id)
+    if counts is None:
+        return
+    slot = 1 if member.bot else 0
+    counts[slot] += delta
+    totals["bots" if member.bot else "humans"] += delta
+
+
+async def on_member_join(member):
+    _adjust(member, 1)
+
+
+async def on_member_remove(member):
+    _adjust(member, -1)
+
+
+async def on_guild_available(guild):
+    estimate(guild)
+
+
+async def on_guild_join(guild):
+    estimate(guild)
+
+
+async def on_guild_remove(guild):
+    _approximate.discard(guild.id)
+    counts = _guilds.pop(guild.id, None)
+    if counts is not None:
+        totals["humans"] -= counts[0]
+        totals["bots"] -= counts[1]
+
+
+def register(bot):
+    for listener in (on_member_join, on_member_remove, on_guild_available, on_guild_join, on_guild_remove):
+        bot.add_listener(listener, listener.__name__)
@@ -0,0 +1,120 @@
+"""
+Streaming file export for bulk listings.
+Rows are pulled in batches on the event loop and serialized to CSV or JSONL
+in a worker thread, into a spooled temp file (memory up to EXPORT_SPOOL_BYTES,
+disk after that), optionally gzip-compressed. The result is uploaded as one
+attachment.
+"""
+import io
+import os
+import csv
+import gzip
+import json
+import asyncio
+import tempfile
+import discord
+
+EXPORT_SPOOL_BYTES = int(os.getenv("EXPORT_SPOOL_BYTES", str(1024 * 1024)))
+EXPORT_BATCH = 500
+FORMATS = ("csv", "jsonl")
+# Upload limit outside of guilds
+DEFAULT_UPLOAD_LIMIT = 10 * 1024 * 1024
+
+
+def parse_options(options):
+    """('jsonl', 'gz') -> ('jsonl', True). Unknown options raise ValueError."""
+    fmt, compress = "csv", False
+    for option in options:
+        option = option.lower()
+        if option in FORMATS:
+            fmt = option
+        elif option in ("gz", "gzip"):
+            compress = True
+        else:
+            raise ValueError(f"Unknown export option `{option}`. Use csv, jsonl and/or gz.")
+    return fmt, compress
+
+
+class _Writer:
+    def __init__(self, columns, fmt, compress):
+        self.columns = columns
+        self.fmt = fmt
+        self.spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES, mode="w+b")
+        self._gzip = gzip.GzipFile(fileobj=self.spool, mode="wb") if compress else None
+        self._text = io.TextIOWrapper(self._gzip or self.spool, encoding="utf-8", newline="")
+        self._csv = csv.writer(self._text) if fmt == "csv" else None
+        if self._csv is not None:
+            self._csv.writerow(columns)
+
+    def write(self, rows):
+        if self._csv is not None:
+            self._csv.writerows(rows)
+        else:
+            for row in rows:
+                self._text.write(json.dumps(dict(zip(self.columns, row)), default=str) + "\n")
+
+    def finish(self):
+        self._text.flush()
+        self._text.detach()
+        if self._gzip is not None:
+            self._gzip.close()
+        size = self.spool.tell()
+        self.spool.seek(0)
+        return size
+
+
+async def _batches(rows):
+    batch = []
+    if hasattr(rows, "__aiter__"):
+        async for row in rows:
+            batch.append(row)
+            if len(batch) >= EXPORT_BATCH:
+                yield batch
+                batch = []
+    else:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= EXPORT_BATCH:
+                yield batch
+                batch = []
+                # Let other events run between batches of a big listing
+                await asyncio.sleep(0)
+    if batch:
+        yield batch
+
+
+async def export_rows(rows, columns, fmt="csv", compress=False):
+    """Serialize `rows` (iterable or async iterable of tuples) and return (file, size, row count)."""
+    loop = asyncio.get_running_loop()
+    writer = _Writer(columns, fmt, compress)
+    count = 0
+    try:
+        async for batch in _batches(rows):
+            await loop.run_in_executor(None, writer.write, batch)
+            count += len(batch)
+        size = await loop.run_in_executor(None, writer.finish)
+    except BaseException:
+        writer.spool.close()
+        raise
+    return writer.spool, size, count
+
+
+async def send_export(ctx, rows, columns, name, options):
+    """Export `rows` and upload them to ctx as `<name>.<fmt>[.gz]`."""
+    try:
+        fmt, compress = parse_options(options)
+    except ValueError as e:
+        await ctx.send(str(e), delete_after=10)
+        return
+
+    async with ctx.typing():
+        spool, size, count = await export_rows(rows, columns, fmt, compress)
+        try:
+            limit = ctx.guild.filesize_limit if ctx.guild else DEFAULT_UPLOAD_LIMIT
+            if size > limit:
+                await ctx.send(f"The export is {size / 1024 / 1024:.1f} MB, over this server's upload limit. Try `gz`.")
+                return
+            filename = f"{name}.{fmt}" + (".gz" if compress else "")
+            await ctx.send(f"Exported {count} rows.", file=discord.File(spool, filename=filename))
+        finally:
+            spool.close()
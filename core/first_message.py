@@ -0,0 +1,141 @@
+"""
+Per-channel first-message jump URLs for `firstmsg`.
+Looked up once with a history call, then kept in the guild's settings under
+`first_messages` ({channel id: {message_id, url}}). An entry is dropped when
+its message is deleted (and looked up again in the background, since the
+channel is known to be asked about) or when the channel itself is deleted,
+which also covers `channel nuke`.
+"""
+import asyncio
+from db.database import get_db, run_db
+from db.settings import SETTINGS_COLLECTION, get_setting, set_setting, seed
+
+FIRST_MESSAGES_KEY = "first_messages"
+# Let a burst of deletes settle before looking the first message up again
+REFETCH_DELAY = 10
+LOAD_BATCH = 1000
+
+_known = {}   # first message id -> (guild id, channel id)
+_channels = {}  # channel id -> first message id, for every entry in _known
+_locks = {}
+_bot = None
+
+
+def _remember(guild_id, channel_id, message_id):
+    _known[message_id] = (guild_id, channel_id)
+    _channels[channel_id] = message_id
+
+
+def _unremember(channel_id):
+    _known.pop(_channels.pop(channel_id, None), None)
+
+
+async def _lookup(channel):
+    async for message in channel.history(limit=1, oldest_first=True):
+        try:
+            entries = dict(await get_setting(channel.guild.id, FIRST_MESSAGES_KEY, {}, strict=True))
+        except Exception as e:
+            # Answer uncached rather than write the map back from a blank read
+            print(f"Error caching first message for channel {channel.id}: {e}")
+            return message.jump_url
+        entries[str(channel.id)] = {"message_id": message.id, "url": message.jump_url}
+        await set_setting(channel.guild.id, FIRST_MESSAGES_KEY, entries)
+        _remember(channel.guild.id, channel.id, message.id)
+        return message.jump_url
+    return None
+
+
+async def jump_url(channel):
+    """Jump URL of the channel's first message, or None if it has none."""
+    if getattr(channel, "guild", None) is None:
+        # DMs have no guild settings to cache in
+        async for message in channel.history(limit=1, oldest_first=True):
+            return message.jump_url
+        return None
+    entry = (await get_setting(channel.guild.id, FIRST_MESSAGES_KEY, {})).get(str(channel.id))
+    if entry is not None:
+        _remember(channel.guild.id, channel.id, entry["message_id"])
+        return entry["url"]
+    lock = _locks.setdefault(channel.id, asyncio.Lock())
+    async with lock:
+        entry = (await get_setting(channel.guild.id, FIRST_MESSAGES_KEY, {})).get(str(channel.id))
+        url = entry["url"] if entry is not None else await _lookup(channel)
+    _locks.pop(channel.id, None)
+    return url
+
+
+async def forget(guild_id, channel_id):
+    try:
+        entries = dict(await get_setting(guild_id, FIRST_MESSAGES_KEY, {}, strict=True))
+    except Exception as e:
+        print(f"Error dropping first message for channel {channel_id}: {e}")
+        return
+    _unremember(channel_id)
+    if entries.pop(str(channel_id), None) is None:
+        return
+    await set_setting(guild_id, FIRST_MESSAGES_KEY, entries)
+
+
+async def _refetch(channel_id):
+    await asyncio.sleep(REFETCH_DELAY)
+    channel = _bot.get_channel(channel_id) if _bot is not None else None
+    if channel is None:
+        return
+    try:
+        await jump_url(channel)
+    except Exception as e:
+        print(f"Error prefetching first message for channel {channel_id}: {e}")
+
+
+async def _message_deleted(message_id):
+    location = _known.get(message_id)
+    if location is None:
+        return
+    guild_id, channel_id = location
+    await forget(guild_id, channel_id)
+    asyncio.create_task(_refetch(channel_id))
+
+
+async def load(bot):
+    """Read the stored entries for this process's guilds once, so deletes can be matched without MongoDB reads."""
+    await bot.wait_until_ready()
+    guild_ids = [guild.id for guild in bot.guilds]
+
+    def find(batch):
+        return list(get_db()[SETTINGS_COLLECTION].find(
+            {'_id': {'$in': batch}, FIRST_MESSAGES_KEY: {'$exists': True, '$ne': {}}}
+        ))
+    documents = []
+    try:
+        for i in range(0, len(guild_ids), LOAD_BATCH):
+            documents += await run_db("load_first_messages", find, guild_ids[i:i + LOAD_BATCH])
+    except Exception as e:
+        print(f"Error loading first-message cache: {e}")
+        return
+    seed(documents)
+    for document in documents:
+        for channel_id, entry in document[FIRST_MESSAGES_KEY].items():
+            _remember(document['_id'], int(channel_id), entry["message_id"])
+    print(f"First-message cache loaded for {len(_known)} channels")
+
+
+async def on_raw_message_delete(payload):
+    await _message_deleted(payload.message_id)
+
+
+async def on_raw_bulk_message_delete(payload):
+    for message_id in payload.message_ids:
+        await _message_deleted(message_id)
+
+
+async def on_guild_channel_delete(channel):
+    # Every entry is in _channels once loaded, so most deletions never touch MongoDB
+    if channel.id in _channels:
+        await forget(channel.guild.id, channel.id)
+
+
+def register(bot):
+    global _bot
+    _bot = bot
+    for listener in (on_raw_message_delete, on_raw_bulk_message_delete, on_guild_channel_delete):
+        bot.add_listener(listener, listener.__name__)
@@ -0,0 +1,50 @@
+"""
+Intents and member-cache policy, chosen with INTENTS_PROFILE:
+  full - every intent, every member of every guild cached at startup (default)
+  lean - no presences, members are only cached for guilds that need them;
+         commands that need the full member list call ensure_members() first
+"""
+import os
+import asyncio
+import discord
+
+INTENTS_PROFILE = os.getenv("INTENTS_PROFILE", "full").strip().lower()
+
+_chunk_locks = {}
+
+
+def build_client_options(profile=INTENTS_PROFILE):
+    """Keyword arguments for the Bot constructor for the given profile."""
+    if profile == "lean":
+        intents = discord.Intents.default()
+        intents.members = True
+        intents.message_content = True
+        return {
+            "intents": intents,
+            # Keep voice members (voice move/vcc) and members who join while we're running
+            "member_cache_flags": discord.MemberCacheFlags.from_intents(intents),
+            "chunk_guilds_at_startup": False,
+        }
+    if profile != "full":
+        print(f"[!] Unknown INTENTS_PROFILE '{profile}', using 'full'")
+    return {
+        "intents": discord.Intents.all(),
+        "member_cache_flags": discord.MemberCacheFlags.all(),
+        "chunk_guilds_at_startup": True,
+    }
+
+
+async def ensure_members(guild):
+    """Make sure `guild.members` is complete, chunking the guild once if it isn't."""
+    if guild is None or guild.chunked:
+        return
+    lock = _chunk_locks.setdefault(guild.id, asyncio.Lock())
+    async with lock:
+        if guild.chunked:
+            return
+        try:
+            await guild.chunk(cache=True)
+        except discord.ClientException as e:
+            # Members intent is off; work with what's cached
+            print(f"Could not chunk guild {guild.id}: {e}")
+    _chunk_locks.pop(guild.id, None)
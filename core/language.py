@@ -0,0 +1,86 @@
+"""
+Language detection engine.
+langdetect loads ~55 language profiles on first use and builds a new
+detector per call. This engine loads the profiles once, in the background at
+startup, seeds the detector so results are deterministic, detects whole
+batches in one worker call, and caches results for short strings.
+"""
+import os
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from langdetect.detector_factory import DetectorFactory, PROFILES_DIRECTORY
+from langdetect.lang_detect_exception import LangDetectException
+
+LANGDETECT_CACHE_SIZE = int(os.getenv("LANGDETECT_CACHE_SIZE", "5000"))
+# Longer texts rarely repeat; don't let them push greetings out of the cache
+CACHEABLE_LENGTH = 200
+UNKNOWN = "und"
+
+
+class LanguageDetector:
+    def __init__(self, cache_size=LANGDETECT_CACHE_SIZE, workers=2):
+        self.cache_size = cache_size
+        self._factory = None
+        self._load_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="langdetect")
+        self._cache = OrderedDict()
+        self._warming = None
+
+    def load(self):
+        """Load the language profiles (blocking; safe to call from any thread)."""
+        with self._load_lock:
+            if self._factory is None:
+                factory = DetectorFactory()
+                factory.load_profile(PROFILES_DIRECTORY)
+                factory.set_seed(0)
+                self._factory = factory
+        return self._factory
+
+    def warm_up(self):
+        """Start loading profiles in the background so the first detection doesn't pay for it."""
+        if self._warming is None:
+            self._warming = asyncio.get_running_loop().run_in_executor(self._executor, self.load)
+        return self._warming
+
+    def detect_sync(self, text):
+        return self.detect_many_sync([text])[0]
+
+    def detect_many_sync(self, texts):
+        factory = self.load()
+        results = []
+        for text in texts:
+            try:
+                detector = factory.create()
+                detector.append(text)
+                results.append(detector.detect())
+            except LangDetectException:
+                results.append(UNKNOWN)
+        return results
+
+    async def detect(self, text):
+        return (await self.detect_many([text]))[0]
+
+    async def detect_many(self, texts):
+        """Language codes for `texts` ('und' when undetectable), in one worker call for the cache misses."""
+        keys = [" ".join(text.split()).lower() for text in texts]
+        results = [self._cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            detected = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.detect_many_sync, [texts[i] for i in missing]
+            )
+            for i, language in zip(missing, detected):
+                results[i] = language
+                if len(keys[i]) <= CACHEABLE_LENGTH:
+                    self._cache[keys[i]] = language
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        for key in keys:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+        return results
+
+
+language_detector = LanguageDetector()
@@ -0,0 +1,143 @@
+"""
+Per-guild member index for the `listing` commands.
+Built once per guild on first use, then kept current from member and role
+events, so listings cost time proportional to their output instead of a scan
+over every member.
+"""
+import discord
+from core.intents import ensure_members
+
+MOD_PERMISSIONS = ("manage_guild", "manage_channels", "manage_roles", "manage_messages")
+
+_indexes = {}
+
+
+class GuildIndex:
+    def __init__(self, guild):
+        self.guild_id = guild.id
+        self.roles = {}          # role id -> member ids
+        self.member_roles = {}   # member id -> role ids
+        self.bots = set()
+        self.norole = set()      # humans with only @everyone
+        self.admins = set()      # humans with administrator
+        self.mods = set()        # humans with any of MOD_PERMISSIONS
+        for member in guild.members:
+            self.add(member)
+
+    def add(self, member):
+        role_ids = tuple(role.id for role in member.roles[1:])
+        self.member_roles[member.id] = role_ids
+        for role_id in role_ids:
+            self.roles.setdefault(role_id, set()).add(member.id)
+        if member.bot:
+            self.bots.add(member.id)
+            return
+        if not role_ids:
+            self.norole.add(member.id)
+        self.classify(member)
+
+    def classify(self, member):
+        """Recompute admin/mod membership from the member's current permissions."""
+        if member.bot:
+            return
+        permissions = member.guild_permissions
+        if permissions.administrator:
+            self.admins.add(member.id)
+        else:
+            self.admins.discard(member.id)
+        if any(getattr(permissions, name) for name in MOD_PERMISSIONS):
+            self.mods.add(member.id)
+        else:
+            self.mods.discard(member.id)
+
+    def remove(self, member_id):
+        for role_id in self.member_roles.pop(member_id, ()):
+            members = self.roles.get(role_id)
+            if members is not None:
+                members.discard(member_id)
+        for group in (self.bots, self.norole, self.admins, self.mods):
+            group.discard(member_id)
+
+    def update(self, member):
+        self.remove(member.id)
+        self.add(member)
+
+    def reclassify(self, guild, member_ids):
+        for member_id in list(member_ids):
+            member = guild.get_member(member_id)
+            if member is not None:
+                self.classify(member)
+
+
+async def get_index(guild):
+    """The guild's index, chunking the guild and building the index on first use."""
+    index = _indexes.get(guild.id)
+    if index is None:
+        await ensure_members(guild)
+        index = _indexes.get(guild.id)
+        if index is None:
+            index = _indexes[guild.id] = GuildIndex(guild)
+    return index
+
+
+def resolve(guild, member_ids):
+    """Members for the given ids, sorted by display name."""
+    members = [guild.get_member(member_id) for member_id in member_ids]
+    return sorted((m for m in members if m is not None), key=lambda m: m.display_name.lower())
+
+
+async def on_member_join(member):
+    index = _indexes.get(member.guild.id)
+    if index is not None:
+        index.add(member)
+
+
+async def on_member_remove(member):
+    index = _indexes.get(member.guild.id)
+    if index is not None:
+        index.remove(member.id)
+
+
+async def on_member_update(before, after):
+    index = _indexes.get(after.guild.id)
+    if index is not None and before.roles != after.roles:
+        index.update(after)
+
+
+async def on_guild_role_update(before, after):
+    index = _indexes.get(after.guild.id)
+    if index is None or before.permissions == after.permissions:
+        return
+    if after.is_default():
+        # @everyone changed: it touches every member
+        _indexes.pop(after.guild.id, None)
+    else:
+        index.reclassify(after.guild, index.roles.get(after.id, ()))
+
+
+async def on_guild_role_delete(role):
+    index = _indexes.get(role.guild.id)
+    if index is None:
+        return
+    member_ids = index.roles.pop(role.id, set())
+    for member_id in member_ids:
+        index.member_roles[member_id] = tuple(r for r in index.member_roles.get(member_id, ()) if r != role.id)
+        if not index.member_roles[member_id] and member_id not in index.bots:
+            index.norole.add(member_id)
+    index.reclassify(role.guild, member_ids)
+
+
+async def on_guild_update(before, after):
+    index = _indexes.get(after.id)
+    if index is not None and before.owner_id != after.owner_id:
+        index.reclassify(after, (before.owner_id, after.owner_id))
+
+
+async def on_guild_remove(guild):
+    _indexes.pop(guild.id, None)
+
+
+def register(bot):
+    for listener in (on_member_join, on_member_remove, on_member_update, on_guild_role_update,
+                     on_guild_role_delete, on_guild_update, on_guild_remove):
+        bot.add_listener(listener, listener.__name__)
@@ -0,0 +1,55 @@
+"""
+Prometheus-style metrics endpoint, enabled by setting METRICS_PORT.
+Serves /metrics with member counters, guild counts and storage latency.
+"""
+import os
+from aiohttp import web
+from core import counters
+from db.database import storage_stats
+from core.translation import translation_cache
+
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+
+def render(bot):
+    lines = [
+        "# TYPE stingg_guilds gauge",
+        f"stingg_guilds {len(bot.guilds)}",
+        "# TYPE stingg_guilds_counted gauge",
+        f"stingg_guilds_counted {counters.counted_guilds()}",
+        "# TYPE stingg_members gauge",
+        f'stingg_members{{kind="human"}} {counters.totals["humans"]}',
+        f'stingg_members{{kind="bot"}} {counters.totals["bots"]}',
+    ]
+    stats = storage_stats()
+    lines += ["# TYPE stingg_storage_queue_depth gauge", f"stingg_storage_queue_depth {stats['queue_depth']}"]
+    lines += ["# TYPE stingg_storage_calls_total counter"]
+    lines += [f'stingg_storage_calls_total{{op="{op}"}} {s["calls"]}' for op, s in stats["ops"].items()]
+    lines += ["# TYPE stingg_storage_avg_ms gauge"]
+    lines += [f'stingg_storage_avg_ms{{op="{op}"}} {s["avg_ms"]:.3f}' for op, s in stats["ops"].items()]
+    t = translation_cache.summary()
+    lines += [
+        "# TYPE stingg_translation_cache_hit_ratio gauge",
+        f"stingg_translation_cache_hit_ratio {t['hit_ratio']:.4f}",
+        "# TYPE stingg_translation_saved_ms counter",
+        f"stingg_translation_saved_ms {t['saved_ms']:.0f}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+async def start(bot):
+    """Start the endpoint if METRICS_PORT is set; returns the runner (or None)."""
+    if not METRICS_PORT:
+        return None
+
+    async def metrics(request):
+        return web.Response(text=render(bot), content_type="text/plain")
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, METRICS_HOST, METRICS_PORT).start()
+    print(f"[OK] Metrics on http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+    return runner
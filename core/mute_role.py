@@ -0,0 +1,117 @@
+"""
+Per-guild Muted role.
+The role id is kept in the guild's settings (`mute_role_id`), so mute and
+unmute resolve it with one dict lookup instead of scanning roles by name.
+When the role has to be created, the send_messages overwrite is rolled out
+to every channel by a background job, MUTE_OVERWRITE_CONCURRENCY channels at
+a time, and channels created later get it from on_guild_channel_create.
+"""
+import os
+import asyncio
+import discord
+from db.settings import get_setting, set_setting
+
+MUTE_ROLE_KEY = "mute_role_id"
+MUTE_ROLE_NAME = "Muted"
+MUTE_OVERWRITE_CONCURRENCY = int(os.getenv("MUTE_OVERWRITE_CONCURRENCY", "3"))
+# Pause after each overwrite, per slot
+OVERWRITE_DELAY = 0.25
+
+_locks = {}
+_rollouts = {}  # guild id -> task
+_role_ids = {}  # guild id -> mute role id (or None), mirrored from settings
+
+
+async def _role_id(guild_id):
+    """The stored mute role id; settings are only read the first time per guild."""
+    if guild_id not in _role_ids:
+        try:
+            _role_ids[guild_id] = await get_setting(guild_id, MUTE_ROLE_KEY, strict=True)
+        except Exception as e:
+            # Not cached, so the next event reads again
+            print(f"Error loading mute role for guild {guild_id}: {e}")
+            return None
+    return _role_ids[guild_id]
+
+
+async def _store_role_id(guild_id, role_id):
+    _role_ids[guild_id] = role_id
+    try:
+        await set_setting(guild_id, MUTE_ROLE_KEY, role_id)
+    except Exception as e:
+        print(f"Error storing mute role for guild {guild_id}: {e}")
+
+
+async def get_mute_role(guild, create=False):
+    """The guild's Muted role, or None; with create=True it is made (and rolled out) if missing."""
+    role = guild.get_role(await _role_id(guild.id) or 0)
+    if role is not None:
+        return role
+    lock = _locks.setdefault(guild.id, asyncio.Lock())
+    async with lock:
+        role = guild.get_role(await _role_id(guild.id) or 0)
+        if role is None:
+            # Guilds muted from before the id was stored
+            role = discord.utils.get(guild.roles, name=MUTE_ROLE_NAME)
+            if role is None and create:
+                role = await guild.create_role(name=MUTE_ROLE_NAME, reason="Creating Muted role for muting users.")
+                start_rollout(guild, role)
+            if role is not None:
+                # On failure the role is still found by name next time
+                await _store_role_id(guild.id, role.id)
+    _locks.pop(guild.id, None)
+    return role
+
+
+async def _deny(channel, role):
+    if channel.overwrites_for(role).send_messages is False:
+        return
+    await channel.set_permissions(role, send_messages=False, reason="Muted role overwrite")
+
+
+async def rollout(guild, role):
+    """Apply the Muted overwrite to every channel that lacks it; returns how many failed."""
+    slots = asyncio.Semaphore(MUTE_OVERWRITE_CONCURRENCY)
+    failed = 0
+
+    async def one(channel):
+        nonlocal failed
+        async with slots:
+            try:
+                await _deny(channel, role)
+            except discord.HTTPException:
+                failed += 1
+            await asyncio.sleep(OVERWRITE_DELAY)
+
+    await asyncio.gather(*(one(channel) for channel in guild.channels))
+    if failed:
+        print(f"Muted role overwrite failed in {failed} channels of guild {guild.id}")
+    return failed
+
+
+def start_rollout(guild, role):
+    task = _rollouts.get(guild.id)
+    if task is None or task.done():
+        task = _rollouts[guild.id] = asyncio.create_task(rollout(guild, role))
+        task.add_done_callback(lambda _: _rollouts.pop(guild.id, None))
+    return task
+
+
+async def on_guild_channel_create(channel):
+    role = channel.guild.get_role(await _role_id(channel.guild.id) or 0)
+    if role is None:
+        return
+    try:
+        await _deny(channel, role)
+    except discord.HTTPException as e:
+        print(f"Could not apply Muted overwrite in channel {channel.id}: {e}")
+
+
+async def on_guild_role_delete(role):
+    if await _role_id(role.guild.id) == role.id:
+        await _store_role_id(role.guild.id, None)
+
+
+def register(bot):
+    for listener in (on_guild_channel_create, on_guild_role_delete):
+        bot.add_listener(listener, listener.__name__)
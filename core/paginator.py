@@ -0,0 +1,117 @@
+"""
+Lazy embed paginator for long listings.
+Takes any iterable (usually a generator) of lines and only pulls enough of it
+to render the page being shown. Rendered pages are cached, so going back is
+free, and the first reply goes out as soon as page one is ready.
+"""
+import discord
+
+LINES_PER_PAGE = 20
+# Embed descriptions are capped at 4096 characters
+MAX_PAGE_CHARS = 4000
+
+
+class LinePaginator(discord.ui.View):
+    def __init__(self, author, lines, title=None, color=discord.Color.blue(),
+                 per_page=LINES_PER_PAGE, timeout=120):
+        super().__init__(timeout=timeout)
+        self.author = author
+        self.title = title
+        self.color = color
+        self.per_page = per_page
+        self.message = None
+        self.index = 0
+        self._lines = iter(lines)
+        self._next_line = None
+        self._exhausted = False
+        self._pages = []
+        self._advance()
+
+    def _advance(self):
+        """Pull one line into the lookahead slot."""
+        try:
+            self._next_line = str(next(self._lines))
+        except StopIteration:
+            self._next_line = None
+            self._exhausted = True
+
+    def _render_next(self):
+        lines, size = [], 0
+        while self._next_line is not None and len(lines) < self.per_page:
+            line = self._next_line
+            if len(line) > MAX_PAGE_CHARS:
+                line = line[:MAX_PAGE_CHARS - 1] + "…"
+            if lines and size + len(line) + 1 > MAX_PAGE_CHARS:
+                break
+            lines.append(line)
+            size += len(line) + 1
+            self._advance()
+        self._pages.append(discord.Embed(title=self.title, description="\n".join(lines), color=self.color))
+
+    def page(self, number):
+        while len(self._pages) <= number and self._next_line is not None:
+            self._render_next()
+        if number >= len(self._pages):
+            return None
+        embed = self._pages[number]
+        total = f" of {len(self._pages)}" if self._exhausted else ""
+        embed.set_footer(text=f"Page {number + 1}{total}")
+        return embed
+
+    @property
+    def empty(self):
+        return not self._pages and self._next_line is None
+
+    def _has_next(self):
+        return self.index + 1 < len(self._pages) or self._next_line is not None
+
+    def _update_buttons(self):
+        self.previous_page.disabled = self.index == 0
+        self.next_page.disabled = not self._has_next()
+
+    async def interaction_check(self, interaction):
+        if interaction.user != self.author:
+            await interaction.response.send_message("You cannot use this button.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.blurple, emoji="◀️")
+    async def previous_page(self, interaction, button):
+        self.index = max(0, self.index - 1)
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.page(self.index), view=self)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.blurple, emoji="▶️")
+    async def next_page(self, interaction, button):
+        if self.page(self.index + 1) is not None:
+            self.index += 1
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.page(self.index), view=self)
+
+    async def on_timeout(self):
+        if self.message is not None:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
+
+    async def send(self, destination):
+        """Send page one to `destination` (a context, channel or user); buttons only if there is more."""
+        embed = self.page(0)
+        self._update_buttons()
+        if not self._has_next():
+            self.stop()
+            self.message = await destination.send(embed=embed)
+        else:
+            self.message = await destination.send(embed=embed, view=self)
+        return self.message
+
+
+async def send_pages(ctx, lines, title, color=discord.Color.blue(), empty_message="Nothing to show.", destination=None):
+    """Paginate `lines` for ctx.author; sends `empty_message` in red if there are none."""
+    paginator = LinePaginator(ctx.author, lines, title=title, color=color)
+    destination = destination or ctx
+    if paginator.empty:
+        paginator.stop()
+        return await destination.send(embed=discord.Embed(description=empty_message, color=discord.Colour.red()))
+    return await paginator.send(destination)
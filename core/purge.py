@@ -0,0 +1,125 @@
+"""
+Bulk purge engine for `clear`.
+Streams channel history newest-first and deletes matching messages in
+100-message bulk deletes. Discord refuses bulk deletes for messages older
+than 14 days, so once history crosses that boundary the engine switches to
+single deletes paced at PURGE_SINGLE_DELAY. Several channels can be purged
+in parallel, PURGE_CONCURRENCY at a time.
+"""
+import os
+import re
+import time
+import asyncio
+import datetime
+import discord
+
+BULK_LIMIT = 100
+# Stay a little inside Discord's 14-day bulk delete window
+BULK_MAX_AGE = datetime.timedelta(days=14) - datetime.timedelta(minutes=5)
+PURGE_SINGLE_DELAY = float(os.getenv("PURGE_SINGLE_DELAY", "1.2"))
+PURGE_CONCURRENCY = int(os.getenv("PURGE_CONCURRENCY", "3"))
+# Give up after scanning this many messages per message asked for
+SCAN_FACTOR = 20
+PROGRESS_INTERVAL = 2.0
+
+LINK_PATTERN = re.compile(r"https?://\S+|discord\.gg/\S+", re.IGNORECASE)
+
+
+def build_check(author=None, bots=None, pattern=None, attachments=False, links=False):
+    """Combine filters into one message predicate."""
+    def check(message):
+        if author is not None and message.author.id != author.id:
+            return False
+        if bots is not None and message.author.bot != bots:
+            return False
+        if pattern is not None and not pattern.search(message.content):
+            return False
+        if attachments and not message.attachments:
+            return False
+        if links and not LINK_PATTERN.search(message.content):
+            return False
+        return True
+    return check
+
+
+class Progress:
+    """Edits one status message, at most every PROGRESS_INTERVAL seconds."""
+
+    def __init__(self, message):
+        self.message = message
+        self.deleted = 0
+        self.scanned = 0
+        self._last_edit = 0.0
+
+    async def update(self, deleted, scanned, force=False):
+        self.deleted += deleted
+        self.scanned += scanned
+        now = time.monotonic()
+        if self.message is None or (not force and now - self._last_edit < PROGRESS_INTERVAL):
+            return
+        self._last_edit = now
+        try:
+            await self.message.edit(content=f"Purging… deleted {self.deleted} messages (scanned {self.scanned}).")
+        except discord.HTTPException:
+            pass
+
+
+async def purge_channel(channel, limit, check=None, before=None, after=None, progress=None):
+    """Delete up to `limit` matching messages; returns (deleted, scanned)."""
+    check = check or (lambda message: True)
+    cutoff = discord.utils.utcnow() - BULK_MAX_AGE
+    deleted = scanned = 0
+    reported_deleted = reported_scanned = 0
+    chunk = []
+
+    async def report(force=False):
+        nonlocal reported_deleted, reported_scanned
+        if progress is not None:
+            await progress.update(deleted - reported_deleted, scanned - reported_scanned, force)
+        reported_deleted, reported_scanned = deleted, scanned
+
+    async for message in channel.history(limit=limit * SCAN_FACTOR, before=before, after=after):
+        scanned += 1
+        if not check(message):
+            continue
+        if message.created_at > cutoff:
+            chunk.append(message)
+            if len(chunk) == BULK_LIMIT:
+                await channel.delete_messages(chunk)
+                deleted += len(chunk)
+                chunk = []
+                await report()
+        else:
+            # Past the bulk-delete window: everything from here on is deleted one by one
+            if chunk:
+                await channel.delete_messages(chunk)
+                deleted += len(chunk)
+                chunk = []
+            try:
+                await message.delete()
+                deleted += 1
+            except discord.NotFound:
+                pass
+            await report()
+            await asyncio.sleep(PURGE_SINGLE_DELAY)
+        if deleted + len(chunk) >= limit:
+            break
+
+    if chunk:
+        await channel.delete_messages(chunk)
+        deleted += len(chunk)
+    await report(force=True)
+    return deleted, scanned
+
+
+async def purge_channels(channels, limit, check=None, progress=None, before=None, after=None):
+    """Purge several channels in parallel; returns {channel: deleted count or the exception}."""
+    slots = asyncio.Semaphore(PURGE_CONCURRENCY)
+
+    async def run(channel):
+        async with slots:
+            deleted, _ = await purge_channel(channel, limit, check, before=before, after=after, progress=progress)
+            return deleted
+
+    results = await asyncio.gather(*(run(channel) for channel in channels), return_exceptions=True)
+    return dict(zip(channels, results))
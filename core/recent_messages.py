@@ -0,0 +1,157 @@
+"""
+Per-channel, per-author ring buffer of recent messages for `listing recent`.
+Fed by on_message and kept current from edit/delete events. Each (channel,
+author) pair keeps at most RECENT_PER_AUTHOR entries, and all pairs together
+stay under RECENT_MAX_BYTES of message text, evicting the least recently
+used pair first. A pair that is short of entries and has never been
+backfilled (after a restart, say) is topped up once by a paced history scan.
+"""
+import os
+import asyncio
+from collections import OrderedDict, deque
+
+RECENT_PER_AUTHOR = int(os.getenv("RECENT_PER_AUTHOR", "15"))
+RECENT_MAX_BYTES = int(os.getenv("RECENT_MAX_BYTES", str(8 * 1024 * 1024)))
+RECENT_SCAN_LIMIT = int(os.getenv("RECENT_SCAN_LIMIT", "1000"))
+# Pause between history pages during a backfill scan
+SCAN_PAGE_DELAY = 0.5
+# Rough per-entry overhead on top of the text itself
+ENTRY_OVERHEAD = 200
+
+_buffers = OrderedDict()  # (channel id, author id) -> deque of [message id, content, created_at]
+_owners = {}              # message id -> (channel id, author id)
+_backfilled = set()       # (channel id, author id) pairs whose history has been scanned
+_size = 0
+
+
+def _cost(content):
+    return len(content) + ENTRY_OVERHEAD
+
+
+def _drop(key):
+    global _size
+    for message_id, content, _ in _buffers.pop(key, ()):
+        _owners.pop(message_id, None)
+        _size -= _cost(content)
+    _backfilled.discard(key)
+
+
+def _add(key, message_id, content, created_at):
+    global _size
+    if message_id in _owners:
+        return
+    entries = _buffers.get(key)
+    if entries is None:
+        entries = _buffers[key] = deque()
+    else:
+        _buffers.move_to_end(key)
+    if len(entries) >= RECENT_PER_AUTHOR:
+        old_id, old_content, _ = entries.popleft()
+        _owners.pop(old_id, None)
+        _size -= _cost(old_content)
+    entries.append([message_id, content, created_at])
+    _owners[message_id] = key
+    _size += _cost(content)
+    while _size > RECENT_MAX_BYTES and len(_buffers) > 1:
+        oldest = next(iter(_buffers))
+        _drop(oldest if oldest != key else list(_buffers)[1])
+
+
+def _find(message_id):
+    key = _owners.get(message_id)
+    if key is None:
+        return None, None
+    for entry in _buffers[key]:
+        if entry[0] == message_id:
+            return key, entry
+    return None, None
+
+
+def _remove(message_id):
+    global _size
+    key, entry = _find(message_id)
+    if entry is None:
+        return
+    entries = _buffers[key]
+    entries.remove(entry)
+    del _owners[message_id]
+    _size -= _cost(entry[1])
+    if not entries:
+        del _buffers[key]
+        _backfilled.discard(key)
+
+
+def record(message):
+    if message.guild is None:
+        return
+    _add((message.channel.id, message.author.id), message.id, message.content, message.created_at)
+
+
+def cached(channel_id, author_id):
+    """Cached (content, created_at) pairs for the author, oldest first; None if nothing is cached."""
+    entries = _buffers.get((channel_id, author_id))
+    if entries is None:
+        return None
+    _buffers.move_to_end((channel_id, author_id))
+    return [(content, created_at) for _, content, created_at in entries]
+
+
+async def recent(channel, author_id):
+    """The author's recent messages in the channel, oldest first, backfilling from history when the buffer is short."""
+    key = (channel.id, author_id)
+    entries = cached(channel.id, author_id)
+    if entries is not None and (len(entries) >= RECENT_PER_AUTHOR or key in _backfilled):
+        return entries
+    found = []
+    scanned = 0
+    async for message in channel.history(limit=RECENT_SCAN_LIMIT):
+        scanned += 1
+        if message.author.id == author_id:
+            found.append(message)
+            if len(found) >= RECENT_PER_AUTHOR:
+                break
+        if scanned % 100 == 0:
+            await asyncio.sleep(SCAN_PAGE_DELAY)
+    # Merge with anything recorded meanwhile, oldest first
+    merged = {message.id: (message.id, message.content, message.created_at) for message in found}
+    for message_id, content, created_at in _buffers.get(key, ()):
+        merged[message_id] = (message_id, content, created_at)
+    _drop(key)
+    for message_id, content, created_at in sorted(merged.values())[-RECENT_PER_AUTHOR:]:
+        _add(key, message_id, content, created_at)
+    if key in _buffers:
+        _backfilled.add(key)
+    return cached(channel.id, author_id) or []
+
+
+async def on_message(message):
+    record(message)
+
+
+async def on_raw_message_edit(payload):
+    global _size
+    if "content" not in payload.data:
+        return
+    _, entry = _find(payload.message_id)
+    if entry is not None:
+        _size += _cost(payload.data["content"]) - _cost(entry[1])
+        entry[1] = payload.data["content"]
+
+
+async def on_raw_message_delete(payload):
+    _remove(payload.message_id)
+
+
+async def on_raw_bulk_message_delete(payload):
+    for message_id in payload.message_ids:
+        _remove(message_id)
+
+
+async def on_guild_channel_delete(channel):
+    for key in [key for key in _buffers if key[0] == channel.id]:
+        _drop(key)
+
+
+def register(bot):
+    for listener in (on_message, on_raw_message_edit, on_raw_message_delete, on_raw_bulk_message_delete, on_guild_channel_delete):
+        bot.add_listener(listener, listener.__name__)
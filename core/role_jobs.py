@@ -0,0 +1,175 @@
+"""
+Role edits and resumable mass role jobs.
+edit_roles() applies role additions and removals with the per-role
+endpoints, skipping roles the member already has (or lacks), so it can't
+drop roles other bots add meanwhile. Mass jobs ("give X to everyone with Y",
+"give X to all humans") change a single role the same way. They walk the
+guild's members in id order, ROLE_JOB_BATCH at a time with
+ROLE_JOB_CONCURRENCY edits in flight, and checkpoint the last finished id
+to the `role_jobs` collection after every batch. Jobs left running when the
+bot stops are resumed from their checkpoint at startup; edits are
+idempotent, so a batch cut off mid-way is simply redone.
+"""
+import os
+import time
+import asyncio
+import secrets
+import discord
+from db.database import get_db, run_db
+from core.intents import ensure_members
+
+ROLE_JOBS_COLLECTION = "role_jobs"
+ROLE_JOB_CONCURRENCY = int(os.getenv("ROLE_JOB_CONCURRENCY", "5"))
+ROLE_JOB_BATCH = 50
+
+
+async def edit_roles(member, add=(), remove=(), reason=None):
+    """Apply role additions/removals, skipping no-ops; returns (added, removed).
+
+    Uses the per-role add/remove endpoints rather than replacing the member's
+    whole role list, so roles added elsewhere since the member was cached survive.
+    """
+    current = member.roles[1:]  # without @everyone
+    added = [role for role in dict.fromkeys(add) if role not in current]
+    removed = [role for role in dict.fromkeys(remove) if role in current and role not in added]
+    if added:
+        await member.add_roles(*added, reason=reason)
+    if removed:
+        await member.remove_roles(*removed, reason=reason)
+    return added, removed
+
+
+def _targets(guild, job):
+    """Members the job applies to, in id order."""
+    if job["source"] == "humans":
+        members = [member for member in guild.members if not member.bot]
+    else:
+        source = guild.get_role(job["source"])
+        members = list(source.members) if source is not None else []
+    return sorted(members, key=lambda member: member.id)
+
+
+def describe(job):
+    source = "all humans" if job["source"] == "humans" else f"<@&{job['source']}>"
+    verb = "Giving" if job["action"] == "give" else "Removing"
+    state = {"running": "", "done": " — finished", "cancelled": " — cancelled"}[job["status"]]
+    return f"`{job['_id']}` {verb} <@&{job['role_id']}> ({source}): {job['done']} edited, {job['failed']} failed{state}"
+
+
+class RoleJobs:
+    def __init__(self, bot):
+        self.bot = bot
+        self._tasks = {}
+        self._task = None
+
+    def _owns(self, guild_id):
+        shard_ids = getattr(self.bot, "shard_ids", None)
+        shard_count = getattr(self.bot, "shard_count", None)
+        if not shard_ids or not shard_count:
+            return True
+        return (guild_id >> 22) % shard_count in shard_ids
+
+    async def _save(self, job, *fields):
+        try:
+            await run_db("role_job", lambda: get_db()[ROLE_JOBS_COLLECTION].update_one(
+                {"_id": job["_id"]}, {"$set": {field: job[field] for field in fields}}, upsert=True))
+        except Exception as e:
+            print(f"Error checkpointing role job {job['_id']}: {e}")
+
+    async def submit(self, guild, channel, author, action, role, source):
+        """Start a mass job; `source` is a Role or the string "humans"."""
+        job = {
+            "_id": secrets.token_hex(3), "guild_id": guild.id, "channel_id": channel.id, "message_id": None,
+            "author_id": author.id, "action": action, "role_id": role.id,
+            "source": source if source == "humans" else source.id,
+            "cursor": 0, "done": 0, "failed": 0, "status": "running", "created": time.time(),
+        }
+        message = await channel.send(describe(job))
+        job["message_id"] = message.id
+        await self._save(job, *job.keys() - {"_id"})
+        self._spawn(job)
+        return job
+
+    def _spawn(self, job):
+        task = asyncio.create_task(self._run(job))
+        self._tasks[job["_id"]] = (job, task)
+        task.add_done_callback(lambda _: self._tasks.pop(job["_id"], None))
+
+    def running(self, guild_id):
+        return [job for job, _ in self._tasks.values() if job["guild_id"] == guild_id]
+
+    async def cancel(self, guild_id, job_id):
+        entry = self._tasks.get(job_id)
+        if entry is None or entry[0]["guild_id"] != guild_id:
+            return False
+        job, task = entry
+        task.cancel()
+        job["status"] = "cancelled"
+        await self._save(job, "status")
+        await self._report(job)
+        return True
+
+    async def _report(self, job):
+        channel = self.bot.get_channel(job["channel_id"])
+        if channel is None or job["message_id"] is None:
+            return
+        try:
+            await channel.get_partial_message(job["message_id"]).edit(content=describe(job))
+        except discord.HTTPException:
+            pass
+
+    async def _run(self, job):
+        guild = self.bot.get_guild(job["guild_id"])
+        role = guild.get_role(job["role_id"]) if guild is not None else None
+        if role is None:
+            job["status"] = "cancelled"
+            await self._save(job, "status")
+            return
+        await ensure_members(guild)
+        reason = f"Mass role job {job['_id']}"
+        slots = asyncio.Semaphore(ROLE_JOB_CONCURRENCY)
+
+        async def one(member):
+            async with slots:
+                try:
+                    # One role at a time: add/remove_roles can't clobber roles other bots add mid-job
+                    if job["action"] == "give":
+                        if role not in member.roles:
+                            await member.add_roles(role, reason=reason)
+                    elif role in member.roles:
+                        await member.remove_roles(role, reason=reason)
+                    job["done"] += 1
+                except discord.HTTPException:
+                    job["failed"] += 1
+
+        members = [member for member in _targets(guild, job) if member.id > job["cursor"]]
+        for start in range(0, len(members), ROLE_JOB_BATCH):
+            batch = members[start:start + ROLE_JOB_BATCH]
+            await asyncio.gather(*(one(member) for member in batch))
+            job["cursor"] = batch[-1].id
+            await self._save(job, "cursor", "done", "failed")
+            await self._report(job)
+        job["status"] = "done"
+        await self._save(job, "status")
+        await self._report(job)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._resume())
+
+    async def _resume(self):
+        await self.bot.wait_until_ready()
+        try:
+            jobs = await run_db("load_role_jobs", lambda: list(get_db()[ROLE_JOBS_COLLECTION].find({"status": "running"})))
+        except Exception as e:
+            print(f"Error loading role jobs: {e}")
+            return
+        jobs = [job for job in jobs if self._owns(job["guild_id"]) and job["_id"] not in self._tasks]
+        for job in jobs:
+            self._spawn(job)
+        if jobs:
+            print(f"Resumed {len(jobs)} role jobs")
+
+    async def close(self):
+        for _, task in list(self._tasks.values()):
+            task.cancel()
@@ -0,0 +1,169 @@
+"""
+Durable job scheduler.
+All timed actions (mute expiry, temp bans, ...) share one min-heap and one
+wakeup task. Jobs are persisted to the `scheduled_jobs` collection and
+reloaded at startup; anything that came due while the bot was down is run
+in one batch.
+
+Command modules register a handler per job kind in their setup():
+
+    bot.scheduler.register("unmute", expire_mute)
+
+and then schedule or cancel jobs by id:
+
+    await bot.scheduler.schedule("unmute", f"unmute:{guild.id}:{user.id}", due, guild.id, user_id=user.id)
+    await bot.scheduler.cancel(f"unmute:{guild.id}:{user.id}")
+"""
+import time
+import heapq
+import asyncio
+import itertools
+from db.database import get_db, run_db
+
+JOBS_COLLECTION = "scheduled_jobs"
+JOB_MAX_ATTEMPTS = 8
+# Seconds before the first retry of a failed job, doubling each attempt
+JOB_RETRY_BASE = 30
+JOB_RETRY_MAX = 3600
+
+
+class Scheduler:
+    def __init__(self, bot):
+        self.bot = bot
+        self._heap = []
+        self._jobs = {}
+        self._handlers = {}
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def register(self, kind, handler):
+        """`handler(bot, job)` is awaited when a job of this kind comes due."""
+        self._handlers[kind] = handler
+
+    def _push(self, job):
+        self._jobs[job["_id"]] = job
+        heapq.heappush(self._heap, (job["due"], next(self._seq), job["_id"]))
+        self._wakeup.set()
+
+    def _owns(self, guild_id):
+        """Whether this process's shards include the guild; every process sees every persisted job."""
+        shard_ids = getattr(self.bot, "shard_ids", None)
+        shard_count = getattr(self.bot, "shard_count", None)
+        if guild_id is None or not shard_ids or not shard_count:
+            return True
+        return (guild_id >> 22) % shard_count in shard_ids
+
+    async def schedule(self, kind, job_id, due, guild_id=None, **data):
+        """Schedule (or reschedule) job `job_id` to run at unix time `due`."""
+        job = {"_id": job_id, "kind": kind, "due": float(due), "guild_id": guild_id, "data": data}
+        self._push(job)
+        try:
+            await run_db("schedule_job", lambda: get_db()[JOBS_COLLECTION].replace_one({"_id": job_id}, job, upsert=True))
+        except Exception as e:
+            print(f"Error persisting job {job_id}: {e}")
+        return job
+
+    async def cancel(self, job_id):
+        """Cancel a pending job. Returns True if it was pending."""
+        job = self._jobs.pop(job_id, None)
+        try:
+            await run_db("cancel_job", lambda: get_db()[JOBS_COLLECTION].delete_one({"_id": job_id}))
+        except Exception as e:
+            print(f"Error deleting job {job_id}: {e}")
+        return job is not None
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    async def load(self):
+        try:
+            jobs = await run_db("load_jobs", lambda: list(get_db()[JOBS_COLLECTION].find()))
+        except Exception as e:
+            print(f"Error loading scheduled jobs: {e}")
+            return
+        jobs = [job for job in jobs if self._owns(job.get("guild_id"))]
+        for job in jobs:
+            self._push(job)
+        overdue = sum(1 for job in jobs if job["due"] <= time.time())
+        print(f"Loaded {len(jobs)} scheduled jobs ({overdue} overdue)")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _pop_due(self, now):
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            when, _, job_id = heapq.heappop(self._heap)
+            job = self._jobs.get(job_id)
+            # Skip heap entries left behind by cancel or reschedule
+            if job is None or job["due"] != when:
+                continue
+            del self._jobs[job_id]
+            due.append(job)
+        return due
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        await self.load()
+        while True:
+            self._wakeup.clear()
+            due = self._pop_due(time.time())
+            if due:
+                await self._run_batch(due)
+                continue
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_batch(self, jobs):
+        results = await asyncio.gather(*(self._run_job(job) for job in jobs), return_exceptions=True)
+        done = []
+        for job, result in zip(jobs, results):
+            if isinstance(result, Exception):
+                await self._retry(job, result)
+            elif job["_id"] not in self._jobs and job["kind"] in self._handlers:
+                # Jobs nobody can handle stay persisted for a process that can
+                done.append(job["_id"])
+        if done:
+            try:
+                await run_db("finish_jobs", lambda: get_db()[JOBS_COLLECTION].delete_many({"_id": {"$in": done}}))
+            except Exception as e:
+                print(f"Error removing {len(done)} finished jobs: {e}")
+
+    async def _retry(self, job, error):
+        """Reschedule a failed job with exponential backoff, giving up after JOB_MAX_ATTEMPTS."""
+        attempts = job.get("attempts", 0) + 1
+        if job["_id"] in self._jobs:
+            # Rescheduled by its handler before failing; that takes precedence
+            return
+        if attempts >= JOB_MAX_ATTEMPTS:
+            print(f"Scheduled job {job['_id']} failed {attempts} times, dropping it: {error}")
+            await self.cancel(job["_id"])
+            return
+        delay = min(JOB_RETRY_BASE * 2 ** (attempts - 1), JOB_RETRY_MAX)
+        print(f"Scheduled job {job['_id']} failed (attempt {attempts}), retrying in {delay}s: {error}")
+        job = {**job, "due": time.time() + delay, "attempts": attempts}
+        self._push(job)
+        try:
+            await run_db("retry_job", lambda: get_db()[JOBS_COLLECTION].replace_one({"_id": job["_id"]}, job, upsert=True))
+        except Exception as e:
+            print(f"Error persisting retry of job {job['_id']}: {e}")
+
+    async def _run_job(self, job):
+        handler = self._handlers.get(job["kind"])
+        if handler is None:
+            print(f"No handler for scheduled job kind '{job['kind']}'")
+            return
+        await handler(self.bot, job)
@@ -0,0 +1,143 @@
+"""
+Shared countdown-timer engine.
+One ticker task drives every running `timer`: updates are kept in a heap,
+long timers are edited less often, edits that would not change the text are
+skipped, and channels whose edits get held up by rate limits are backed off.
+Edits and final mentions run as their own tasks, so the ticker never waits
+on Discord and a slow channel can't delay another timer's deadline.
+"""
+import time
+import heapq
+import asyncio
+import itertools
+import discord
+
+# (remaining seconds at most, seconds between edits)
+EDIT_INTERVALS = [(60, 5), (600, 15), (3600, 60)]
+LONG_INTERVAL = 300
+# discord.py sleeps through 429s inside edit(); an edit taking this long was rate limited
+SLOW_EDIT_SECONDS = 2
+
+
+def edit_interval(remaining):
+    for limit, interval in EDIT_INTERVALS:
+        if remaining <= limit:
+            return interval
+    return LONG_INTERVAL
+
+
+def format_remaining(remaining):
+    """Render remaining time; coarser for long timers so unchanged text can be skipped."""
+    remaining = max(0, int(remaining + 0.999))
+    if remaining >= 3600:
+        return f"{remaining // 3600}h {remaining % 3600 // 60:02d}m"
+    if remaining >= 600:
+        return f"{remaining // 60} minutes"
+    return f"{remaining} seconds"
+
+
+class TimerEngine:
+    def __init__(self):
+        self._heap = []
+        self._timers = {}
+        self._ids = itertools.count()
+        self._backoff = {}
+        self._editing = set()
+        self._tasks = set()
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def __len__(self):
+        return len(self._timers)
+
+    def add(self, message, embed, mention, deadline):
+        """Track `message` (showing `embed`) until `deadline`, then mention the author."""
+        timer_id = next(self._ids)
+        self._timers[timer_id] = {
+            "message": message,
+            "channel": message.channel,
+            "embed": embed,
+            "mention": mention,
+            "deadline": deadline,
+            "text": embed.fields[0].value if embed.fields else None,
+        }
+        self._push(timer_id, min(time.time() + edit_interval(deadline - time.time()), deadline))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return timer_id
+
+    def _push(self, timer_id, when):
+        heapq.heappush(self._heap, (when, timer_id))
+        self._wakeup.set()
+
+    async def _run(self):
+        while self._timers:
+            self._wakeup.clear()
+            now = time.time()
+            due = []
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap)[1])
+            if due:
+                self._tick(due, now)
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._heap[0][0] - now if self._heap else None)
+            except asyncio.TimeoutError:
+                pass
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _tick(self, timer_ids, now):
+        for timer_id in timer_ids:
+            timer = self._timers.get(timer_id)
+            if timer is None:
+                continue
+            remaining = timer["deadline"] - now
+            if remaining <= 0:
+                del self._timers[timer_id]
+                self._spawn(self._finish(timer))
+                continue
+            channel_id = timer["channel"].id
+            text = format_remaining(remaining)
+            # One edit in flight per channel; a busy or backed-off channel just skips this update
+            if (text != timer["text"] and timer["message"] is not None
+                    and channel_id not in self._editing and self._backoff.get(channel_id, 0) <= now):
+                self._editing.add(channel_id)
+                self._spawn(self._edit(channel_id, timer, text))
+            self._push(timer_id, min(now + edit_interval(remaining), timer["deadline"]))
+
+    async def _edit(self, channel_id, timer, text):
+        timer["embed"].set_field_at(0, name="Time Remaining", value=text)
+        started = time.time()
+        try:
+            await timer["message"].edit(embed=timer["embed"])
+            timer["text"] = text
+        except discord.NotFound:
+            # Message deleted; still mention at the deadline
+            timer["message"] = None
+        except discord.HTTPException as e:
+            print(f"Timer edit failed in channel {channel_id}: {e}")
+        finally:
+            self._editing.discard(channel_id)
+            elapsed = time.time() - started
+            if elapsed > SLOW_EDIT_SECONDS:
+                self._backoff[channel_id] = time.time() + elapsed
+
+    async def _finish(self, timer):
+        # Mention first so it lands on the deadline, then tidy up the countdown
+        try:
+            await timer["channel"].send(f"{timer['mention']}, your timer has ended!", delete_after=10)
+        except discord.HTTPException as e:
+            print(f"Could not send timer mention: {e}")
+        if timer["message"] is not None:
+            timer["embed"].set_field_at(0, name="Time Remaining", value="Time's up!")
+            try:
+                await timer["message"].edit(embed=timer["embed"])
+            except discord.HTTPException:
+                pass
+
+
+timer_engine = TimerEngine()
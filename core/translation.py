@@ -0,0 +1,292 @@
+"""
+Translation: cache, worker pool and upstream backends.
+
+Results are keyed by a hash of the whitespace-normalized text and the target
+language. An in-memory LRU sits in front of an optional persistent tier with
+a TTL, picked with TRANSLATION_CACHE_BACKEND:
+  memory - LRU only (default)
+  disk   - plus a SQLite file at TRANSLATION_CACHE_PATH
+  mongo  - plus the `translations` collection (TTL index on created_at)
+
+Upstream calls are blocking, so they run on a bounded worker pool with a
+per-call timeout, and concurrent requests for the same text share one call.
+TRANSLATOR_BACKEND picks the upstream:
+  google - deep_translator's GoogleTranslator (default)
+  echo   - local stand-in for load tests; no network
+"""
+import os
+import time
+import sqlite3
+import hashlib
+import asyncio
+import datetime
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from db.database import get_db, run_db
+from core.language import language_detector
+
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "2000"))
+TRANSLATION_CACHE_TTL = int(os.getenv("TRANSLATION_CACHE_TTL", str(7 * 86400)))
+TRANSLATION_CACHE_BACKEND = os.getenv("TRANSLATION_CACHE_BACKEND", "memory").strip().lower()
+TRANSLATION_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH", os.path.join("data", "translations.sqlite3"))
+TRANSLATOR_BACKEND = os.getenv("TRANSLATOR_BACKEND", "google").strip().lower()
+TRANSLATION_WORKERS = int(os.getenv("TRANSLATION_WORKERS", "4"))
+TRANSLATION_TIMEOUT = float(os.getenv("TRANSLATION_TIMEOUT", "10"))
+ECHO_DELAY = float(os.getenv("TRANSLATOR_ECHO_DELAY", "0.2"))
+
+
+def normalize(text):
+    return " ".join(text.split())
+
+
+def cache_key(text, target):
+    return hashlib.sha256(f"{target}\0{normalize(text)}".encode("utf-8")).hexdigest()
+
+
+class DiskBacking:
+    """SQLite tier; all access goes through one thread."""
+
+    def __init__(self, path=TRANSLATION_CACHE_PATH, ttl=TRANSLATION_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translation-cache")
+        self._conn = None
+        self._puts = 0
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, text TEXT, source TEXT, expires_at REAL)")
+        return self._conn
+
+    def _get(self, key):
+        row = self._connect().execute(
+            "SELECT text, source FROM translations WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return {"text": row[0], "source": row[1]} if row else None
+
+    def _put(self, key, value):
+        conn = self._connect()
+        conn.execute("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)",
+                     (key, value["text"], value["source"], time.time() + self.ttl))
+        self._puts += 1
+        if self._puts % 500 == 0:
+            conn.execute("DELETE FROM translations WHERE expires_at <= ?", (time.time(),))
+        conn.commit()
+
+    async def get(self, key):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._get, key)
+
+    async def put(self, key, value):
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._put, key, value)
+
+
+class MongoBacking:
+    """`translations` collection; MongoDB's TTL monitor removes expired entries."""
+
+    def __init__(self, ttl=TRANSLATION_CACHE_TTL):
+        self.ttl = ttl
+        self._indexed = False
+        self._index_lock = threading.Lock()
+
+    def _collection(self):
+        collection = get_db()["translations"]
+        with self._index_lock:
+            if not self._indexed:
+                collection.create_index("created_at", expireAfterSeconds=self.ttl)
+                self._indexed = True
+        return collection
+
+    async def get(self, key):
+        document = await run_db("translation_get", lambda: self._collection().find_one({"_id": key}))
+        return {"text": document["text"], "source": document["source"]} if document else None
+
+    async def put(self, key, value):
+        document = {**value, "created_at": datetime.datetime.now(datetime.timezone.utc)}
+        await run_db("translation_put", lambda: self._collection().replace_one({"_id": key}, document, upsert=True))
+
+
+class TranslationCache:
+    def __init__(self, max_size=TRANSLATION_CACHE_SIZE, backing=None):
+        self.max_size = max_size
+        self.backing = backing
+        self._entries = OrderedDict()
+        self.stats = {"memory_hits": 0, "backing_hits": 0, "misses": 0, "upstream_calls": 0, "upstream_ms": 0.0}
+
+    def _remember(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get(self, text, target):
+        """Cached {'text', 'source'} for this text and target language, or None."""
+        key = cache_key(text, target)
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return value
+        if self.backing is not None:
+            try:
+                value = await self.backing.get(key)
+            except Exception as e:
+                print(f"Translation cache read failed: {e}")
+            if value is not None:
+                self.stats["backing_hits"] += 1
+                self._remember(key, value)
+                return value
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, text, target, value, upstream_ms):
+        """Store a fresh upstream result; `upstream_ms` is what the call cost."""
+        self.stats["upstream_calls"] += 1
+        self.stats["upstream_ms"] += upstream_ms
+        key = cache_key(text, target)
+        self._remember(key, value)
+        if self.backing is not None:
+            try:
+                await self.backing.put(key, value)
+            except Exception as e:
+                print(f"Translation cache write failed: {e}")
+
+    def summary(self):
+        stats = self.stats
+        hits = stats["memory_hits"] + stats["backing_hits"]
+        lookups = hits + stats["misses"]
+        avg_upstream_ms = stats["upstream_ms"] / stats["upstream_calls"] if stats["upstream_calls"] else 0.0
+        return {
+            **stats,
+            "entries": len(self._entries),
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "avg_upstream_ms": avg_upstream_ms,
+            "saved_ms": hits * avg_upstream_ms,
+        }
+
+
+def make_cache(backend=TRANSLATION_CACHE_BACKEND):
+    if backend == "disk":
+        return TranslationCache(backing=DiskBacking())
+    if backend == "mongo":
+        return TranslationCache(backing=MongoBacking())
+    return TranslationCache()
+
+
+class GoogleBackend:
+    # Google rejects requests over 5000 characters
+    MAX_BATCH_CHARS = 4500
+
+    def translate(self, text, target):
+        # Imported here so the echo backend works without the translation packages
+        from deep_translator import GoogleTranslator
+        return {"text": GoogleTranslator(source='auto', target=target).translate(text), "source": language_detector.detect_sync(text)}
+
+    def translate_batch(self, texts, target):
+        """Translate single-line texts with one request per MAX_BATCH_CHARS by sending them newline-joined."""
+        from deep_translator import GoogleTranslator
+        translator = GoogleTranslator(source='auto', target=target)
+        texts = [" ".join(text.split()) for text in texts]
+        results, group, size = [], [], 0
+        for text in texts + [None]:
+            if group and (text is None or size + len(text) + 1 > self.MAX_BATCH_CHARS):
+                lines = (translator.translate("\n".join(group)) or "").split("\n")
+                if len(lines) != len(group):
+                    # Upstream merged or split lines; fall back to one call per text
+                    lines = [translator.translate(item) for item in group]
+                results.extend(lines)
+                group, size = [], 0
+            if text is not None:
+                group.append(text)
+                size += len(text) + 1
+        return results
+
+
+class EchoBackend:
+    """Stand-in upstream: waits ECHO_DELAY seconds and returns the text unchanged."""
+
+    def __init__(self, delay=ECHO_DELAY):
+        self.delay = delay
+
+    def translate(self, text, target):
+        time.sleep(self.delay)
+        return {"text": text, "source": "und"}
+
+    def translate_batch(self, texts, target):
+        time.sleep(self.delay)
+        return list(texts)
+
+
+def make_backend(kind=TRANSLATOR_BACKEND):
+    if kind == "echo":
+        return EchoBackend()
+    return GoogleBackend()
+
+
+class Translator:
+    def __init__(self, backend, cache, workers=TRANSLATION_WORKERS, timeout=TRANSLATION_TIMEOUT):
+        self.backend = backend
+        self.cache = cache
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translate")
+        self._slots = asyncio.Semaphore(workers)
+        self._inflight = {}
+        self.coalesced = 0
+
+    async def translate(self, text, target="en"):
+        """{'text', 'source'} for `text` in `target`. Raises asyncio.TimeoutError if upstream is too slow."""
+        cached = await self.cache.get(text, target)
+        if cached is not None:
+            return cached
+        key = cache_key(text, target)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._call(text, target))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
+
+    async def translate_many(self, texts, target="en", sources=None):
+        """Translate several texts with one batched upstream call for whatever isn't cached."""
+        results = [await self.cache.get(text, target) for text in texts]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+        batch = [texts[i] for i in missing]
+        started = time.perf_counter()
+        translated = await self._run(self.backend.translate_batch, batch, target)
+        per_text_ms = (time.perf_counter() - started) * 1000 / len(batch)
+        for i, text in zip(missing, translated):
+            results[i] = {"text": text, "source": sources[i] if sources else "und"}
+            await self.cache.put(texts[i], target, results[i], per_text_ms)
+        return results
+
+    async def _run(self, fn, *args):
+        """Run a backend call on the pool, raising asyncio.TimeoutError after `timeout`.
+
+        The slot is held until the worker thread actually finishes, even after a
+        timeout, so slow upstreams can't pile up more threads than `workers`.
+        """
+        await self._slots.acquire()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        # shield: a timeout must not cancel the future and free the slot early
+        return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+
+    async def _call(self, text, target):
+        started = time.perf_counter()
+        result = await self._run(self.backend.translate, text, target)
+        await self.cache.put(text, target, result, (time.perf_counter() - started) * 1000)
+        return result
+
+
+translation_cache = make_cache()
+translator = Translator(make_backend(), translation_cache)
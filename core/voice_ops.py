@@ -0,0 +1,64 @@
+"""
+Bulk voice operations (move, mute, deafen, disconnect).
+Member edits share one rate-limit bucket per guild, so every guild gets
+VOICE_CONCURRENCY slots; discord.py waits out 429s and retries server errors
+itself. A member that fails is recorded and the rest of the batch carries on,
+and the caller gets one summary for the whole batch.
+"""
+import os
+import asyncio
+import discord
+
+VOICE_CONCURRENCY = int(os.getenv("VOICE_CONCURRENCY", "5"))
+
+OPERATIONS = {
+    "move": lambda member, channel, reason: member.move_to(channel, reason=reason),
+    "disconnect": lambda member, channel, reason: member.move_to(None, reason=reason),
+    "mute": lambda member, channel, reason: member.edit(mute=True, reason=reason),
+    "unmute": lambda member, channel, reason: member.edit(mute=False, reason=reason),
+    "deafen": lambda member, channel, reason: member.edit(deafen=True, reason=reason),
+    "undeafen": lambda member, channel, reason: member.edit(deafen=False, reason=reason),
+}
+
+PAST_TENSE = {
+    "move": "Moved", "disconnect": "Disconnected", "mute": "Muted",
+    "unmute": "Unmuted", "deafen": "Deafened", "undeafen": "Undeafened",
+}
+
+_slots = {}  # guild id -> semaphore
+
+
+async def run(guild, members, operation, channel=None, reason=None):
+    """Apply `operation` to every member still in voice; returns {'done', 'skipped', 'failed': [(member, error)]}."""
+    slots = _slots.setdefault(guild.id, asyncio.Semaphore(VOICE_CONCURRENCY))
+    targets = [member for member in members if member.voice is not None and member.voice.channel != channel]
+    summary = {"done": 0, "skipped": len(members) - len(targets), "failed": []}
+
+    async def one(member):
+        async with slots:
+            try:
+                await OPERATIONS[operation](member, channel, reason)
+                summary["done"] += 1
+            except Exception as e:
+                # e.g. Forbidden, or a ClientException for a member who left voice mid-batch
+                summary["failed"].append((member, e))
+
+    await asyncio.gather(*(one(member) for member in targets))
+    return summary
+
+
+def _reason(error):
+    if isinstance(error, discord.HTTPException):
+        return error.text or error.status
+    return str(error) or type(error).__name__
+
+
+def describe(summary, verb):
+    """One-line summary, plus the first few failures."""
+    text = f"{verb} {summary['done']} members"
+    if summary["skipped"]:
+        text += f", skipped {summary['skipped']}"
+    if summary["failed"]:
+        text += f", {len(summary['failed'])} failed"
+        text += "".join(f"\n{member.mention}: {_reason(error)}" for member, error in summary["failed"][:5])
+    return text
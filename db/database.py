@@ -1,5 +1,9 @@
 import os
+import time
+import asyncio
+import threading
 import certifi
+from concurrent.futures import ThreadPoolExecutor
 from pymongo.mongo_client import MongoClient
 from pymongo.server_api import ServerApi
 from dotenv import load_dotenv
@@ -23,71 +27,160 @@ def _connect_mongo(relax_tls=False):
         kwargs["tlsAllowInvalidHostnames"] = True
     return MongoClient(MONGODB_URI, **kwargs)
 
+# Connected lazily from the storage pool, so an outage at boot never blocks
+# startup and a later call can still connect once MongoDB is back
+MONGO_RETRY_SECONDS = float(os.getenv("MONGO_RETRY_SECONDS", "5"))
+
 client = None
-try:
-    client = _connect_mongo(relax_tls=False)
-    client.admin.command('ping')
-    print("[OK] Connected to MongoDB successfully!")
-except Exception as e:
-    err_msg = str(e).lower()
-    if "ssl" in err_msg or "tls" in err_msg:
-        if os.getenv("MONGO_DEV_TLS", "").strip() in ("1", "true", "yes"):
+db = None
+_connect_lock = threading.Lock()
+_last_attempt = 0.0
+
+
+def _connect():
+    """Connect and ping, falling back to relaxed TLS when MONGO_DEV_TLS allows it."""
+    connection = _connect_mongo(relax_tls=False)
+    try:
+        connection.admin.command('ping')
+        print("[OK] Connected to MongoDB successfully!")
+        return connection
+    except Exception as e:
+        connection.close()
+        err_msg = str(e).lower()
+        if ("ssl" in err_msg or "tls" in err_msg) and os.getenv("MONGO_DEV_TLS", "").strip() in ("1", "true", "yes"):
             print("[!] Secure TLS failed. Retrying with relaxed TLS (MONGO_DEV_TLS=1)...")
+            connection = _connect_mongo(relax_tls=True)
             try:
-                client = _connect_mongo(relax_tls=True)
-                client.admin.command('ping')
-                print("[OK] Connected to MongoDB (relaxed TLS). Use only for local/dev.")
-            except Exception as e2:
-                print(f"[FAIL] Error connecting to MongoDB: {e2}")
-                client = None
-        else:
-            print(f"[FAIL] Error connecting to MongoDB: {e}")
-            print("   Tip: On Windows, if this is an SSL handshake error, try setting MONGO_DEV_TLS=1 in .env (dev only).")
-            client = None
-    else:
+                connection.admin.command('ping')
+            except Exception:
+                connection.close()
+                raise
+            print("[OK] Connected to MongoDB (relaxed TLS). Use only for local/dev.")
+            return connection
         print(f"[FAIL] Error connecting to MongoDB: {e}")
-        client = None
+        if "ssl" in err_msg or "tls" in err_msg:
+            print("   Tip: On Windows, if this is an SSL handshake error, try setting MONGO_DEV_TLS=1 in .env (dev only).")
+        raise
 
-db = client['discord_bot'] if client else None
 
 def get_db():
-    """Get database instance"""
-    if db is None:
-        raise RuntimeError("MongoDB connection not established")
+    """Get database instance, connecting on first use. Blocking: call it from the storage pool."""
+    global client, db, _last_attempt
+    if db is not None:
+        return db
+    with _connect_lock:
+        if db is None:
+            if time.monotonic() - _last_attempt < MONGO_RETRY_SECONDS:
+                raise RuntimeError("MongoDB connection not established")
+            try:
+                client = _connect()
+            except Exception as e:
+                # Fail fast for a while instead of tying up a storage worker on every call
+                _last_attempt = time.monotonic()
+                raise RuntimeError(f"MongoDB connection not established: {e}") from e
+            db = client['discord_bot']
     return db
 
-def save_prefix(guild_id, prefix):
-    """Save prefix to MongoDB"""
+# Storage pool: every pymongo call runs here so a slow round-trip never blocks the event loop
+STORAGE_WORKERS = int(os.getenv("STORAGE_WORKERS", "4"))
+STORAGE_SLOW_MS = float(os.getenv("STORAGE_SLOW_MS", "250"))
+
+_executor = ThreadPoolExecutor(max_workers=STORAGE_WORKERS, thread_name_prefix="storage")
+_slots = asyncio.Semaphore(STORAGE_WORKERS)
+_queued = 0
+_op_stats = {}
+
+
+async def run_db(op, fn, *args, **kwargs):
+    """Run a blocking storage call on the storage pool and record its latency under `op`."""
+    global _queued
+    _queued += 1
+    queued_at = time.perf_counter()
     try:
-        prefixes_collection = get_db()['prefixes']
-        prefixes_collection.update_one(
-            {'_id': guild_id},
-            {'$set': {'prefix': prefix}},
-            upsert=True
-        )
-        print(f"Saved prefix '{prefix}' for guild {guild_id} to MongoDB")
-        return True
-    except Exception as e:
-        print(f"Error saving prefix to MongoDB: {e}")
-        return False
+        await _slots.acquire()
+    finally:
+        _queued -= 1
+    started = time.perf_counter()
+    stats = _op_stats.setdefault(op, {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "wait_ms": 0.0})
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, lambda: fn(*args, **kwargs))
+    except Exception:
+        stats["errors"] += 1
+        raise
+    finally:
+        _slots.release()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats["calls"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        stats["wait_ms"] += (started - queued_at) * 1000
+        if elapsed_ms >= STORAGE_SLOW_MS:
+            print(f"[SLOW] storage {op} took {elapsed_ms:.0f}ms (queue depth {_queued})")
+
+
+def storage_stats():
+    """Queue depth and per-operation latency of the storage pool."""
+    ops = {}
+    for op, stats in _op_stats.items():
+        calls = stats["calls"] or 1
+        ops[op] = {
+            "calls": stats["calls"],
+            "errors": stats["errors"],
+            "avg_ms": stats["total_ms"] / calls,
+            "max_ms": stats["max_ms"],
+            "avg_wait_ms": stats["wait_ms"] / calls,
+        }
+    return {"queue_depth": _queued, "workers": STORAGE_WORKERS, "ops": ops}
+
+
+def _get_prefix(guild_id):
+    prefixes_collection = get_db()['prefixes']
+    result = prefixes_collection.find_one({'_id': guild_id})
+    return result['prefix'] if result else None
+
+def _load_all_prefixes():
+    prefixes_collection = get_db()['prefixes']
+    results = prefixes_collection.find()
+    return {doc['_id']: doc['prefix'] for doc in results}
+
+def _find_prefixes(guild_ids):
+    prefixes_collection = get_db()['prefixes']
+    results = prefixes_collection.find({'_id': {'$in': list(guild_ids)}})
+    return {doc['_id']: doc['prefix'] for doc in results}
+
+async def find_prefixes(guild_ids):
+    """Prefixes for the given guilds as {guild_id: prefix}; raises on database errors"""
+    from db.write_behind import write_buffer
+    found = await run_db("find_prefixes", _find_prefixes, guild_ids)
+    for guild_id in guild_ids:
+        pending = write_buffer.pending('prefixes', guild_id)
+        if pending and 'prefix' in pending:
+            found[guild_id] = pending['prefix']
+    return found
+
+async def save_prefix(guild_id, prefix):
+    """Queue a prefix write; it reaches MongoDB with the next write-behind flush"""
+    from db.write_behind import write_buffer
+    write_buffer.queue_set('prefixes', guild_id, {'prefix': prefix})
+    return True
 
-def get_prefix(guild_id):
-    """Get prefix from MongoDB"""
+async def get_prefix(guild_id):
+    """Get prefix, preferring a write that has not been flushed yet"""
+    from db.write_behind import write_buffer
+    pending = write_buffer.pending('prefixes', guild_id)
+    if pending and 'prefix' in pending:
+        return pending['prefix']
     try:
-        prefixes_collection = get_db()['prefixes']
-        result = prefixes_collection.find_one({'_id': guild_id})
-        return result['prefix'] if result else None
+        return await run_db("get_prefix", _get_prefix, guild_id)
     except Exception as e:
         print(f"Error retrieving prefix from MongoDB: {e}")
         return None
 
-def load_all_prefixes():
+async def load_all_prefixes():
     """Load all prefixes from MongoDB"""
     try:
-        prefixes_collection = get_db()['prefixes']
-        results = prefixes_collection.find()
-        prefixes = {doc['_id']: doc['prefix'] for doc in results}
-        return prefixes
+        return await run_db("load_all_prefixes", _load_all_prefixes)
     except Exception as e:
         print(f"Error loading prefixes from MongoDB: {e}")
-        return {}
\ No newline at end of file
+        return {}
@@ -0,0 +1,186 @@
+"""
+Cross-process cache invalidation.
+When one bot process changes a cached setting, every other process needs to
+hear about it. Backends, picked with INVALIDATION_BUS:
+  none  - single process, nothing to do (default)
+  local - in-process hub, for tests and running several bots in one process
+  unix  - datagram Unix sockets in INVALIDATION_SOCKET_DIR, one per process
+  mongo - MongoDB change streams on the settings collections (needs a replica set)
+Handlers are called as handler(key, value) for a namespace such as "prefix".
+"""
+import os
+import json
+import glob
+import socket
+import asyncio
+import threading
+from db.database import get_db
+
+INVALIDATION_BUS = os.getenv("INVALIDATION_BUS", "none").strip().lower()
+INVALIDATION_SOCKET_DIR = os.getenv("INVALIDATION_SOCKET_DIR", "/tmp/stingg-bus")
+
+# namespace -> (collection, field) watched by the MongoDB backend
+WATCHED = {
+    "prefix": ("prefixes", "prefix"),
+}
+
+
+class InvalidationBus:
+    def __init__(self):
+        self._handlers = {}
+
+    def subscribe(self, namespace, handler):
+        self._handlers.setdefault(namespace, []).append(handler)
+
+    def _deliver(self, namespace, key, value):
+        for handler in self._handlers.get(namespace, []):
+            try:
+                handler(key, value)
+            except Exception as e:
+                print(f"Invalidation handler for {namespace} failed: {e}")
+
+    async def publish(self, namespace, key, value):
+        """Tell other processes that `key` in `namespace` is now `value`."""
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class LocalBus(InvalidationBus):
+    """Delivers to every other LocalBus sharing the same hub."""
+    hubs = {}
+
+    def __init__(self, hub="default"):
+        super().__init__()
+        self.hub = hub
+
+    async def start(self):
+        LocalBus.hubs.setdefault(self.hub, []).append(self)
+
+    async def publish(self, namespace, key, value):
+        for peer in LocalBus.hubs.get(self.hub, []):
+            if peer is not self:
+                peer._deliver(namespace, key, value)
+
+    async def close(self):
+        peers = LocalBus.hubs.get(self.hub, [])
+        if self in peers:
+            peers.remove(self)
+
+
+class UnixSocketBus(InvalidationBus):
+    """Each process binds <dir>/<pid>.sock and sends datagrams to every other socket there."""
+
+    def __init__(self, directory=INVALIDATION_SOCKET_DIR):
+        super().__init__()
+        self.directory = directory
+        self.path = os.path.join(directory, f"{os.getpid()}.sock")
+        self._sock = None
+
+    async def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.path)
+        self._sock.setblocking(False)
+        asyncio.get_running_loop().add_reader(self._sock.fileno(), self._on_readable)
+
+    def _on_readable(self):
+        while True:
+            try:
+                data = self._sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                return
+            try:
+                message = json.loads(data)
+                self._deliver(message["ns"], message["key"], message["value"])
+            except (ValueError, KeyError) as e:
+                print(f"Dropped malformed invalidation message: {e}")
+
+    async def publish(self, namespace, key, value):
+        data = json.dumps({"ns": namespace, "key": key, "value": value}).encode()
+        for peer in glob.glob(os.path.join(self.directory, "*.sock")):
+            if peer == self.path:
+                continue
+            try:
+                self._sock.sendto(data, peer)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Process is gone; clean up its socket
+                try:
+                    os.unlink(peer)
+                except OSError:
+                    pass
+            except BlockingIOError:
+                print(f"Invalidation peer {peer} is not keeping up; message dropped")
+
+    async def close(self):
+        if self._sock is not None:
+            asyncio.get_running_loop().remove_reader(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class MongoChangeStreamBus(InvalidationBus):
+    """Watches the settings collections; every flushed write reaches every process. publish() is a no-op."""
+
+    def __init__(self, watched=WATCHED):
+        super().__init__()
+        self.watched = watched
+        self._streams = []
+        self._stopping = threading.Event()
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        for namespace, (collection, field) in self.watched.items():
+            thread = threading.Thread(
+                target=self._watch, args=(loop, namespace, collection, field),
+                name=f"watch-{collection}", daemon=True
+            )
+            thread.start()
+
+    def _watch(self, loop, namespace, collection, field):
+        resume_token = None
+        delay = 1
+        while not self._stopping.is_set():
+            try:
+                with get_db()[collection].watch(full_document="updateLookup", resume_after=resume_token) as stream:
+                    self._streams.append(stream)
+                    delay = 1
+                    for change in stream:
+                        resume_token = stream.resume_token
+                        key = change["documentKey"]["_id"]
+                        document = change.get("fullDocument") or {}
+                        value = None if change["operationType"] == "delete" else document.get(field)
+                        loop.call_soon_threadsafe(self._deliver, namespace, key, value)
+            except Exception as e:
+                if self._stopping.is_set():
+                    return
+                print(f"Change stream on {collection} failed: {e}; retrying in {delay}s")
+                self._stopping.wait(delay)
+                delay = min(delay * 2, 60)
+
+    async def close(self):
+        self._stopping.set()
+        for stream in self._streams:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+
+def make_bus(kind=INVALIDATION_BUS):
+    if kind == "local":
+        return LocalBus()
+    if kind == "unix":
+        return UnixSocketBus()
+    if kind == "mongo":
+        return MongoChangeStreamBus()
+    return InvalidationBus()
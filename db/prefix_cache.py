@@ -0,0 +1,131 @@
+"""
+Lazy, bounded cache of guild prefixes.
+Entries are loaded from MongoDB the first time a guild is seen and evicted
+least-recently-used once PREFIX_CACHE_SIZE guilds are cached. Guilds without a
+custom prefix are cached as None so DEFAULT_PREFIX lookups skip MongoDB.
+"""
+import os
+import asyncio
+from collections import OrderedDict
+from db.database import find_prefixes
+
+PREFIX_CACHE_SIZE = int(os.getenv("PREFIX_CACHE_SIZE", "5000"))
+PREFIX_WARM_LIMIT = int(os.getenv("PREFIX_WARM_LIMIT", "1000"))
+WARM_BATCH = 500
+
+
+class PrefixCache:
+    def __init__(self, max_size=PREFIX_CACHE_SIZE, on_change=None):
+        self.max_size = max_size
+        self.on_change = on_change
+        self._entries = OrderedDict()
+        self._loading = {}
+        # Snapshot values, kept for guilds evicted from the LRU
+        self._fallback = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, guild_id):
+        return guild_id in self._entries
+
+    def __setitem__(self, guild_id, prefix):
+        self._store(guild_id, prefix)
+
+    def get(self, guild_id, default=None):
+        """Cached prefix without touching MongoDB; `default` on a miss or negative entry."""
+        prefix = self._entries.get(guild_id)
+        return default if prefix is None else prefix
+
+    def pop(self, guild_id, default=None):
+        self._fallback.pop(guild_id, None)
+        if guild_id not in self._entries:
+            return default
+        prefix = self._entries.pop(guild_id)
+        self._changed()
+        return prefix
+
+    def refresh(self, guild_id, prefix):
+        """Apply a change made elsewhere, only for guilds this process has cached."""
+        if guild_id in self._entries:
+            self._store(guild_id, prefix)
+        elif guild_id in self._fallback:
+            self._fallback[guild_id] = prefix
+
+    def seed(self, entries):
+        """Fill the cache from a snapshot without treating it as a change."""
+        self._fallback.update(entries)
+        for guild_id, prefix in list(entries.items())[-self.max_size:]:
+            self._entries[guild_id] = prefix
+
+    def items(self):
+        return self._entries.items()
+
+    def _store(self, guild_id, prefix):
+        changed = guild_id not in self._entries or self._entries[guild_id] != prefix
+        self._entries[guild_id] = prefix
+        if guild_id in self._fallback:
+            self._fallback[guild_id] = prefix
+        self._entries.move_to_end(guild_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        if changed:
+            self._changed()
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
+
+    def lookup(self, guild_id, default=None):
+        """Cached prefix without waiting: on a miss, answer from the snapshot (or `default`) and load in the background."""
+        if guild_id in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(guild_id)
+            prefix = self._entries[guild_id]
+            return default if prefix is None else prefix
+        self.misses += 1
+        if guild_id not in self._loading:
+            future = asyncio.ensure_future(self._load([guild_id]))
+            self._loading[guild_id] = future
+            future.add_done_callback(lambda _: self._loading.pop(guild_id, None))
+        prefix = self._fallback.get(guild_id)
+        return default if prefix is None else prefix
+
+    async def fetch(self, guild_id, default=None):
+        """Cached prefix, loading it once from MongoDB on a miss. Concurrent misses share one query."""
+        if guild_id in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(guild_id)
+            prefix = self._entries[guild_id]
+            return default if prefix is None else prefix
+
+        self.misses += 1
+        future = self._loading.get(guild_id)
+        if future is None:
+            future = asyncio.ensure_future(self._load([guild_id]))
+            self._loading[guild_id] = future
+            future.add_done_callback(lambda _: self._loading.pop(guild_id, None))
+        await asyncio.shield(future)
+        prefix = self._entries.get(guild_id)
+        return default if prefix is None else prefix
+
+    async def _load(self, guild_ids):
+        try:
+            found = await find_prefixes(guild_ids)
+        except Exception as e:
+            # Don't negative-cache on errors, the next message retries
+            print(f"Error loading prefixes for {len(guild_ids)} guilds: {e}")
+            return
+        for guild_id in guild_ids:
+            if guild_id not in self._entries or guild_id in found:
+                self._store(guild_id, found.get(guild_id))
+
+    async def warm(self, guild_ids, limit=PREFIX_WARM_LIMIT):
+        """Preload prefixes for up to `limit` guilds (e.g. the ones in the READY payload)."""
+        missing = [guild_id for guild_id in guild_ids if guild_id not in self._entries][:limit]
+        for i in range(0, len(missing), WARM_BATCH):
+            await self._load(missing[i:i + WARM_BATCH])
+        if missing:
+            print(f"Warmed prefix cache for {len(missing)} guilds")
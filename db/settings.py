@@ -0,0 +1,78 @@
+"""
+Per-guild settings (max warns, mute role, ...), one document per guild in
+`guild_settings`. Documents are cached after the first read and written
+through the write-behind buffer, so the cache is the source of truth while a
+write is pending.
+"""
+import os
+import asyncio
+from collections import OrderedDict
+from db.database import get_db, run_db
+from db.write_behind import write_buffer
+
+SETTINGS_COLLECTION = "guild_settings"
+SETTINGS_CACHE_SIZE = int(os.getenv("SETTINGS_CACHE_SIZE", "5000"))
+
+_cache = OrderedDict()
+_loading = {}
+
+
+def _find_settings(guild_id):
+    return get_db()[SETTINGS_COLLECTION].find_one({'_id': guild_id}) or {}
+
+
+async def _load(guild_id):
+    """The cached settings document, reading it on a miss. Raises if the read fails; nothing is cached then."""
+    if guild_id in _cache:
+        _cache.move_to_end(guild_id)
+        return _cache[guild_id]
+    future = _loading.get(guild_id)
+    if future is None:
+        future = asyncio.ensure_future(run_db("get_settings", _find_settings, guild_id))
+        _loading[guild_id] = future
+        future.add_done_callback(lambda _: _loading.pop(guild_id, None))
+    document = await asyncio.shield(future)
+    if guild_id not in _cache:
+        pending = write_buffer.pending(SETTINGS_COLLECTION, guild_id) or {}
+        _cache[guild_id] = {**document, **pending}
+        while len(_cache) > SETTINGS_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return _cache[guild_id]
+
+
+async def get_guild_settings(guild_id, strict=False):
+    """The guild's settings document ({} if it has none). Concurrent misses share one read.
+
+    A failed read returns {} (uncached) unless `strict`, in which case it raises;
+    anything that reads a value to modify and write it back must pass strict=True.
+    """
+    try:
+        return await _load(guild_id)
+    except Exception as e:
+        if strict:
+            raise
+        print(f"Error loading settings for guild {guild_id}: {e}")
+        return {}
+
+
+async def get_setting(guild_id, key, default=None, strict=False):
+    return (await get_guild_settings(guild_id, strict)).get(key, default)
+
+
+async def set_setting(guild_id, key, value):
+    """Update the cached value now and queue the write. Raises if the settings can't be read."""
+    settings = await _load(guild_id)
+    if guild_id not in _cache:
+        _cache[guild_id] = settings
+    settings[key] = value
+    write_buffer.queue_set(SETTINGS_COLLECTION, guild_id, {key: value})
+
+def seed(documents):
+    """Prime the cache with settings documents read in bulk; cached entries win."""
+    for document in documents:
+        guild_id = document['_id']
+        if guild_id not in _cache:
+            pending = write_buffer.pending(SETTINGS_COLLECTION, guild_id) or {}
+            _cache[guild_id] = {**document, **pending}
+    while len(_cache) > SETTINGS_CACHE_SIZE:
+        _cache.popitem(last=False)
@@ -0,0 +1,116 @@
+"""
+On-disk snapshot of the prefix cache.
+Loaded at startup so guilds keep their prefix even when MongoDB is slow or
+down, then reconciled against MongoDB in the background. The file is
+rewritten atomically (temp file + os.replace) a few seconds after a change.
+"""
+import os
+import json
+import time
+import asyncio
+import tempfile
+from db.database import find_prefixes
+
+SNAPSHOT_PATH = os.getenv("PREFIX_SNAPSHOT_PATH", os.path.join("data", "prefix_snapshot.json"))
+SNAPSHOT_DELAY = float(os.getenv("PREFIX_SNAPSHOT_DELAY", "5"))
+RECONCILE_BATCH = 500
+RECONCILE_RETRIES = 5
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """Read the snapshot as {guild_id: prefix or None}; empty if missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"[FAIL] Could not read prefix snapshot {path}: {e}")
+        return {}
+    entries = {int(guild_id): prefix for guild_id, prefix in data.get("prefixes", {}).items()}
+    entries.update({int(guild_id): None for guild_id in data.get("none", [])})
+    return entries
+
+
+def write_snapshot(entries, path=SNAPSHOT_PATH):
+    """Atomically replace the snapshot with `entries` ({guild_id: prefix or None})."""
+    data = {
+        "v": 1,
+        "saved_at": int(time.time()),
+        "prefixes": {str(guild_id): prefix for guild_id, prefix in entries.items() if prefix is not None},
+        "none": [guild_id for guild_id, prefix in entries.items() if prefix is None],
+    }
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SnapshotWriter:
+    """Debounced writer: changes within SNAPSHOT_DELAY seconds share one rewrite."""
+
+    def __init__(self, cache, path=SNAPSHOT_PATH, delay=SNAPSHOT_DELAY):
+        self.cache = cache
+        self.path = path
+        self.delay = delay
+        self._timer = None
+        self._writing = None
+
+    def mark_dirty(self):
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.delay, self._start_write)
+
+    def _start_write(self):
+        self._timer = None
+        if self._writing is None or self._writing.done():
+            self._writing = asyncio.get_running_loop().create_task(self.write())
+        else:
+            self.mark_dirty()
+
+    async def write(self):
+        # Copy on the loop; serialize and fsync off it
+        entries = dict(self.cache.items())
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, write_snapshot, entries, self.path)
+        except Exception as e:
+            print(f"[FAIL] Could not write prefix snapshot {self.path}: {e}")
+
+    async def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+            await self.write()
+        elif self._writing is not None:
+            await self._writing
+
+
+async def reconcile(cache, guild_ids):
+    """Re-read snapshot guilds from MongoDB and correct the cache, retrying while MongoDB is unavailable."""
+    guild_ids = list(guild_ids)
+    delay = 5
+    for attempt in range(RECONCILE_RETRIES):
+        try:
+            for i in range(0, len(guild_ids), RECONCILE_BATCH):
+                batch = guild_ids[i:i + RECONCILE_BATCH]
+                found = await find_prefixes(batch)
+                for guild_id in batch:
+                    if guild_id in cache:
+                        cache[guild_id] = found.get(guild_id)
+            print(f"Reconciled {len(guild_ids)} snapshot prefixes with MongoDB")
+            return
+        except Exception as e:
+            print(f"Prefix reconcile attempt {attempt + 1} failed: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 120)
+    print("[FAIL] Giving up on prefix reconcile; snapshot values stay in use")
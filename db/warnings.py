@@ -0,0 +1,113 @@
+"""
+Per-guild warning counts and history.
+Counts live in `warn_counts` (one document per guild member, changed with
+atomic $inc upserts) and every warn is appended to `warn_events`. Counts are
+cached in memory and both kinds of write go through the write-behind buffer,
+so a burst of warns during a raid costs one bulk_write, not one round-trip each.
+"""
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from pymongo import ASCENDING, DESCENDING
+from db.database import get_db, run_db
+from db.write_behind import write_buffer
+
+COUNTS_COLLECTION = "warn_counts"
+EVENTS_COLLECTION = "warn_events"
+WARN_CACHE_SIZE = int(os.getenv("WARN_CACHE_SIZE", "10000"))
+
+_counts = OrderedDict()
+_loading = {}
+
+
+def _count_id(guild_id, user_id):
+    return f"{guild_id}:{user_id}"
+
+
+def _find_count(guild_id, user_id):
+    document = get_db()[COUNTS_COLLECTION].find_one({'_id': _count_id(guild_id, user_id)})
+    return document['count'] if document else 0
+
+
+def _apply_pending(guild_id, user_id, count):
+    """Apply writes that haven't reached MongoDB yet to a stored count."""
+    pending = write_buffer.pending_entry(COUNTS_COLLECTION, _count_id(guild_id, user_id))
+    if pending:
+        count = pending["$set"].get("count", count) + pending["$inc"].get("count", 0)
+    return count
+
+
+async def get_warn_count(guild_id, user_id):
+    key = (guild_id, user_id)
+    if key in _counts:
+        _counts.move_to_end(key)
+        return _counts[key]
+    future = _loading.get(key)
+    if future is None:
+        future = asyncio.ensure_future(run_db("get_warn_count", _find_count, guild_id, user_id))
+        _loading[key] = future
+        future.add_done_callback(lambda _: _loading.pop(key, None))
+    try:
+        count = await asyncio.shield(future)
+    except Exception as e:
+        # Keep warning during an outage, but don't cache a guess; the next call reads again
+        print(f"Error loading warn count for {key}: {e}")
+        return _apply_pending(guild_id, user_id, 0)
+    if key not in _counts:
+        _counts[key] = _apply_pending(guild_id, user_id, count)
+        while len(_counts) > WARN_CACHE_SIZE:
+            _counts.popitem(last=False)
+    return _counts[key]
+
+
+async def add_warn(guild_id, user_id, moderator_id, reason=None):
+    """Record a warn and return the member's new warn count."""
+    count = await get_warn_count(guild_id, user_id) + 1
+    if (guild_id, user_id) in _counts:
+        # Only a count that came from MongoDB is cached; the queued $inc below covers the rest
+        _counts[(guild_id, user_id)] = count
+    write_buffer.queue_inc(COUNTS_COLLECTION, _count_id(guild_id, user_id), {'count': 1})
+    write_buffer.queue_set(COUNTS_COLLECTION, _count_id(guild_id, user_id), {'guild_id': guild_id, 'user_id': user_id})
+    write_buffer.queue_insert(EVENTS_COLLECTION, {
+        'guild_id': guild_id,
+        'user_id': user_id,
+        'moderator_id': moderator_id,
+        'reason': reason,
+        'created_at': time.time(),
+    })
+    return count
+
+
+async def reset_warns(guild_id, user_id):
+    _counts[(guild_id, user_id)] = 0
+    write_buffer.queue_set(COUNTS_COLLECTION, _count_id(guild_id, user_id), {'count': 0})
+
+
+async def warn_history(guild_id, user_id=None, limit=10):
+    """Most recent warns in a guild, optionally for one member, newest first."""
+    query = {'guild_id': guild_id}
+    if user_id is not None:
+        query['user_id'] = user_id
+
+    def find():
+        cursor = get_db()[EVENTS_COLLECTION].find(query).sort('created_at', DESCENDING).limit(limit)
+        return list(cursor)
+
+    events = await run_db("warn_history", find)
+    # Warns still in the write-behind buffer are newer than anything stored
+    pending = [event for event in write_buffer.pending_inserts(EVENTS_COLLECTION)
+               if all(event.get(field) == value for field, value in query.items())]
+    return (list(reversed(pending)) + events)[:limit]
+
+
+async def ensure_indexes():
+    """Indexes backing warn_history: per member and per guild, newest first."""
+    def create():
+        events = get_db()[EVENTS_COLLECTION]
+        events.create_index([('guild_id', ASCENDING), ('user_id', ASCENDING), ('created_at', DESCENDING)])
+        events.create_index([('guild_id', ASCENDING), ('created_at', DESCENDING)])
+    try:
+        await run_db("warn_indexes", create)
+    except Exception as e:
+        print(f"Error creating warning indexes: {e}")
@@ -0,0 +1,204 @@
+"""
+Write-behind buffer for settings writes.
+Repeated writes to the same document are merged in memory and flushed as
+bulk_write batches once WRITE_BATCH_SIZE operations are pending or
+WRITE_FLUSH_SECONDS have passed, whichever comes first.
+$set writes overwrite each other, $inc writes add up, and inserts are
+batched as they are.
+
+Only the operations a failed bulk_write reports in writeErrors are retried.
+Updates carrying $inc are tagged with a write token (kept in the document's
+`_writes`), so an $inc whose outcome is unknown, after a timeout for
+instance, can be resent without being applied twice; until it resolves,
+newer writes to the same document wait behind it.
+"""
+import os
+import asyncio
+import secrets
+from pymongo import UpdateOne, InsertOne
+from pymongo.errors import BulkWriteError
+from db.database import get_db, run_db
+
+WRITE_BATCH_SIZE = int(os.getenv("WRITE_BATCH_SIZE", "100"))
+WRITE_FLUSH_SECONDS = float(os.getenv("WRITE_FLUSH_SECONDS", "2"))
+
+
+def _merge(entry, sets=None, incs=None):
+    """Apply newer $set/$inc fields on top of a pending {'$set', '$inc'} entry."""
+    for field, value in (sets or {}).items():
+        entry["$set"][field] = value
+        entry["$inc"].pop(field, None)
+    for field, amount in (incs or {}).items():
+        if field in entry["$set"]:
+            entry["$set"][field] += amount
+        else:
+            entry["$inc"][field] = entry["$inc"].get(field, 0) + amount
+    return entry
+
+
+def _new_entry():
+    return {"$set": {}, "$inc": {}}
+
+
+# How many recent write tokens each document remembers
+WRITE_TOKENS_KEPT = 20
+DUPLICATE_KEY = 11000
+
+
+def _update_op(_id, entry):
+    update = {op: entry[op] for op in ("$set", "$inc") if entry[op]}
+    if not entry["$inc"]:
+        return UpdateOne({'_id': _id}, update, upsert=True)
+    # A document that already has the token makes the filter miss and the
+    # upsert fail with a duplicate key, which is how a replay is recognised
+    entry.setdefault("token", secrets.token_hex(8))
+    update["$push"] = {"_writes": {"$each": [entry["token"]], "$slice": -WRITE_TOKENS_KEPT}}
+    return UpdateOne({'_id': _id, '_writes': {'$ne': entry["token"]}}, update, upsert=True)
+
+
+class WriteBehindBuffer:
+    def __init__(self, batch_size=WRITE_BATCH_SIZE, flush_seconds=WRITE_FLUSH_SECONDS):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        # (collection, _id) -> {'$set': {...}, '$inc': {...}}
+        self._pending = {}
+        # (collection, _id) -> tokened entry that may or may not have been applied
+        self._uncertain = {}
+        # collection -> [documents]
+        self._inserts = {}
+        self._timer = None
+        self._flushing = None
+
+    def __len__(self):
+        return len(self._pending) + len(self._uncertain) + sum(len(docs) for docs in self._inserts.values())
+
+    def queue_set(self, collection, _id, fields):
+        """Merge `fields` into the pending $set for this document and schedule a flush."""
+        _merge(self._pending.setdefault((collection, _id), _new_entry()), sets=fields)
+        self._schedule()
+
+    def queue_inc(self, collection, _id, fields):
+        """Add `fields` to the pending $inc for this document and schedule a flush."""
+        _merge(self._pending.setdefault((collection, _id), _new_entry()), incs=fields)
+        self._schedule()
+
+    def queue_insert(self, collection, document):
+        self._inserts.setdefault(collection, []).append(document)
+        self._schedule()
+
+    def pending(self, collection, _id):
+        """Fields still waiting to be $set for this document, or None."""
+        entry = self.pending_entry(collection, _id)
+        return entry["$set"] if entry else None
+
+    def pending_entry(self, collection, _id):
+        """The pending {'$set', '$inc'} update for this document, or None."""
+        uncertain = self._uncertain.get((collection, _id))
+        entry = self._pending.get((collection, _id))
+        if uncertain is None:
+            return entry
+        combined = _merge(_new_entry(), uncertain["$set"], uncertain["$inc"])
+        return _merge(combined, entry["$set"], entry["$inc"]) if entry else combined
+
+    def pending_inserts(self, collection):
+        return list(self._inserts.get(collection, []))
+
+    def _schedule(self):
+        if len(self) >= self.batch_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_seconds, self._start_flush)
+
+    def _start_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flushing is None or self._flushing.done():
+            self._flushing = asyncio.get_running_loop().create_task(self.flush())
+
+    async def _write(self, collection, updates, documents):
+        """One unordered bulk_write; returns the (updates, documents) that must be retried."""
+        ops = [_update_op(_id, entry) for _id, entry in updates]
+        ops += [InsertOne(document) for document in documents]
+        try:
+            await run_db("bulk_write", lambda: get_db()[collection].bulk_write(ops, ordered=False))
+            print(f"Flushed {len(ops)} writes to {collection}")
+            return [], []
+        except BulkWriteError as e:
+            failed_updates, failed_documents = [], []
+            for error in e.details.get("writeErrors", []):
+                index = error["index"]
+                if index < len(updates):
+                    _id, entry = updates[index]
+                    # A duplicate key on a tokened update means it was applied before
+                    if not (error["code"] == DUPLICATE_KEY and "token" in entry):
+                        failed_updates.append(updates[index])
+                elif error["code"] != DUPLICATE_KEY:
+                    # Inserts keep the _id given on the first attempt, so a duplicate is one that already landed
+                    failed_documents.append(documents[index - len(updates)])
+            if failed_updates or failed_documents:
+                print(f"{len(failed_updates) + len(failed_documents)} of {len(ops)} writes to {collection} failed: {e}")
+            return failed_updates, failed_documents
+        except Exception as e:
+            print(f"Error flushing {len(ops)} writes to {collection}: {e}")
+            return updates, documents
+
+    def _requeue(self, collection, updates, documents):
+        for _id, entry in updates:
+            key = (collection, _id)
+            if "token" in entry:
+                # May already be applied: resend as is, never merged with newer writes
+                self._uncertain[key] = entry
+                continue
+            newer = self._pending.get(key)
+            if newer is not None:
+                _merge(entry, newer["$set"], newer["$inc"])
+            self._pending[key] = entry
+        if documents:
+            self._inserts[collection] = documents + self._inserts.get(collection, [])
+
+    async def flush(self):
+        """Write everything pending as one bulk_write per collection."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        # Settle writes with an unknown outcome first; newer writes to the same documents wait for them
+        uncertain, self._uncertain = self._uncertain, {}
+        by_collection = {}
+        for (collection, _id), entry in uncertain.items():
+            by_collection.setdefault(collection, []).append((_id, entry))
+        for collection, updates in by_collection.items():
+            failed, _ = await self._write(collection, updates, [])
+            self._requeue(collection, failed, [])
+
+        batch = {key: entry for key, entry in self._pending.items() if key not in self._uncertain}
+        self._pending = {key: entry for key, entry in self._pending.items() if key in self._uncertain}
+        inserts, self._inserts = self._inserts, {}
+        by_collection = {}
+        for (collection, _id), entry in batch.items():
+            by_collection.setdefault(collection, ([], []))[0].append((_id, entry))
+        for collection, documents in inserts.items():
+            by_collection.setdefault(collection, ([], []))[1].extend(documents)
+
+        for collection, (updates, documents) in by_collection.items():
+            failed_updates, failed_documents = await self._write(collection, updates, documents)
+            self._requeue(collection, failed_updates, failed_documents)
+
+        if len(self) and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_seconds, self._start_flush)
+
+    async def drain(self):
+        """Flush until nothing is pending; called on shutdown."""
+        if self._flushing is not None and not self._flushing.done():
+            await self._flushing
+        if len(self):
+            await self.flush()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if len(self):
+            print(f"[FAIL] {len(self)} settings writes could not be flushed before shutdown")
+
+
+write_buffer = WriteBehindBuffer()
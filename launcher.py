@@ -0,0 +1,125 @@
+"""
+Cluster launcher: runs several bot processes, each owning a range of shards.
+
+    python launcher.py --workers 4            # shard count recommended by Discord
+    python launcher.py --workers 2 --shards 8
+
+Every worker runs main.py with SHARD_COUNT, SHARD_IDS and CLUSTER_ID set.
+Crashed workers are restarted with backoff; a worker that exits cleanly
+(the owner `off` command) is not. Combined stats are printed periodically.
+"""
+import os
+import sys
+import time
+import signal
+import argparse
+import subprocess
+import requests
+from dotenv import load_dotenv
+
+from core.cluster import shard_ranges, read_stats, CLUSTER_STATS_DIR
+
+load_dotenv()
+
+STABLE_AFTER = 60
+MAX_BACKOFF = 300
+REPORT_EVERY = 60
+
+
+def recommended_shards(token):
+    response = requests.get(
+        "https://discord.com/api/v10/gateway/bot",
+        headers={"Authorization": f"Bot {token}"},
+        timeout=10,
+    )
+    response.raise_for_status()
+    return response.json()["shards"]
+
+
+class Worker:
+    def __init__(self, cluster_id, shard_ids, shard_count):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.process = None
+        self.started_at = 0
+        self.backoff = 1
+        self.restart_at = 0
+        self.done = False
+
+    def start(self):
+        env = dict(os.environ)
+        env["SHARD_COUNT"] = str(self.shard_count)
+        env["SHARD_IDS"] = ",".join(str(i) for i in self.shard_ids)
+        env["CLUSTER_ID"] = str(self.cluster_id)
+        env["CLUSTER_STATS_DIR"] = CLUSTER_STATS_DIR
+        self.process = subprocess.Popen([sys.executable, "main.py"], env=env)
+        self.started_at = time.time()
+        print(f"[launcher] cluster {self.cluster_id} started (pid {self.process.pid}, shards {self.shard_ids[0]}-{self.shard_ids[-1]})")
+
+    def poll(self):
+        if self.done:
+            return
+        if self.process is None:
+            if time.time() >= self.restart_at:
+                self.start()
+            return
+        code = self.process.poll()
+        if code is None:
+            return
+        self.process = None
+        if code == 0:
+            print(f"[launcher] cluster {self.cluster_id} shut down cleanly")
+            self.done = True
+            return
+        if time.time() - self.started_at > STABLE_AFTER:
+            self.backoff = 1
+        print(f"[launcher] cluster {self.cluster_id} exited with {code}; restarting in {self.backoff}s")
+        self.restart_at = time.time() + self.backoff
+        self.backoff = min(self.backoff * 2, MAX_BACKOFF)
+
+    def stop(self):
+        self.done = True
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+
+
+def report():
+    stats = read_stats()
+    guilds = sum(s["guilds"] for s in stats.values())
+    humans = sum(s["humans"] for s in stats.values())
+    print(f"[launcher] {len(stats)} clusters reporting: {guilds} guilds, {humans} members (excluding bots)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the bot as several sharded worker processes.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shards", type=int, default=None, help="total shard count (default: Discord's recommendation)")
+    args = parser.parse_args()
+
+    shard_count = args.shards or recommended_shards(os.getenv("BOT_TOKEN"))
+    workers = [Worker(i, ids, shard_count) for i, ids in enumerate(shard_ranges(shard_count, args.workers))]
+    print(f"[launcher] {shard_count} shards across {len(workers)} workers")
+
+    def shutdown(*_):
+        for worker in workers:
+            worker.stop()
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    last_report = time.time()
+    while not all(worker.done for worker in workers):
+        for worker in workers:
+            worker.poll()
+        if time.time() - last_report >= REPORT_EVERY:
+            report()
+            last_report = time.time()
+        time.sleep(1)
+
+    for worker in workers:
+        if worker.process is not None:
+            worker.process.wait()
+
+
+if __name__ == "__main__":
+    main()
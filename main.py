@@ -3,7 +3,19 @@ from discord.ext import commands
 from dotenv import load_dotenv
 import importlib.util
 
-from commands.utility.prefix import load_all_prefixes
+from db.prefix_cache import PrefixCache
+from db.snapshot import SnapshotWriter, load_snapshot, reconcile
+from db.invalidation import make_bus
+from core import cluster
+from core.intents import build_client_options
+from core.scheduler import Scheduler
+from core.role_jobs import RoleJobs
+from db import warnings as warnings_db
+from core import member_index, counters, metrics, ban_cache, recent_messages, first_message, mute_role
+from core.paginator import send_pages
+from core import autotranslate
+from core.language import language_detector
+from db.write_behind import write_buffer
 from commands.error_handlers import on_command_error, on_error
 from commands.helpcommand import help_command   
 from commands.utility.translate import translate
@@ -15,14 +27,21 @@ token = os.getenv('BOT_TOKEN')
 # Default prefix for servers that haven't set one and for DMs
 DEFAULT_PREFIX = "s."
 
-def get_prefix(bot, message):
-    """Only server-specific prefixes (from MongoDB); default if none set."""
+async def get_prefix(bot, message):
+    """Only server-specific prefixes (cached from MongoDB); default if none set."""
     if message.guild:
-        return bot.custom_prefixes.get(message.guild.id, DEFAULT_PREFIX)
+        # Never waits on MongoDB: a miss answers from the snapshot or the default and loads in the background
+        return bot.custom_prefixes.lookup(message.guild.id, DEFAULT_PREFIX)
     return DEFAULT_PREFIX
 
-intents = discord.Intents.all()
-bot = commands.Bot(command_prefix=get_prefix, intents=intents, help_command=None)
+# Intents and member caching come from INTENTS_PROFILE; see core/intents.py
+client_options = build_client_options()
+if cluster.is_sharded():
+    # One gateway connection per shard; launcher.py hands each worker its shard range
+    bot = commands.AutoShardedBot(command_prefix=get_prefix, help_command=None,
+                                  shard_count=cluster.SHARD_COUNT, shard_ids=cluster.SHARD_IDS, **client_options)
+else:
+    bot = commands.Bot(command_prefix=get_prefix, help_command=None, **client_options)
 # bot = commands.Bot(command_prefix=get_prefix, intents=intents)
 
 # Admin check
@@ -35,6 +54,8 @@ def is_admin():
 @bot.event
 async def on_ready():
     print(f'{bot.user.name} #{bot.user.discriminator} has connected to Discord({discord.__version__})')
+    # Warm the prefix cache for the guilds we were handed in READY only
+    asyncio.create_task(bot.custom_prefixes.warm([guild.id for guild in bot.guilds]))
     status_messages = [
         discord.Activity(type=discord.ActivityType.listening, name=f"{DEFAULT_PREFIX}help"),
         discord.Activity(type=discord.ActivityType.watching, name="Unique commands"),
@@ -78,12 +99,9 @@ async def cmd(ctx):
 
 @bot.command()
 async def cmdhelp(ctx):
-    embed = discord.Embed(title="Command Help", color=discord.Color.green())
-    for c in bot.commands:
-        if c.help:
-            embed.add_field(name=c.name, value=c.help, inline=False)
+    lines = (f"**{c.name}**\n{c.help}" for c in bot.commands if c.help)
     try:
-        await ctx.author.send(embed=embed)
+        await send_pages(ctx, lines, "Command Help", color=discord.Color.green(), destination=ctx.author)
     except discord.Forbidden:
         await ctx.send("I can't DM you. Please allow DMs from this server.", delete_after=5)
 
@@ -93,15 +111,24 @@ async def on_message(message):
     if message.author.bot:
         return
     if message.guild and bot.user.mentioned_in(message):
-        server_prefix = bot.custom_prefixes.get(message.guild.id, DEFAULT_PREFIX)
+        server_prefix = await bot.custom_prefixes.fetch(message.guild.id, DEFAULT_PREFIX)
         embed = discord.Embed(
             description=f"My prefix for this server is `{server_prefix}`. Use `{server_prefix}help` for commands.",
             color=discord.Color.blue()
         )
         await message.channel.send(embed=embed)
         return
+    if message.guild and autotranslate.is_enabled(message.channel.id):
+        prefix = await bot.custom_prefixes.fetch(message.guild.id, DEFAULT_PREFIX)
+        if not message.content.startswith(prefix):
+            await autotranslate.feed(message)
     await bot.process_commands(message)
 
+# Forget the prefix of guilds we leave
+@bot.event
+async def on_guild_remove(guild):
+    bot.custom_prefixes.pop(guild.id)
+
 # Change command name
 @bot.command()
 async def change(ctx, old_command_name: str, new_command_name: str):
@@ -126,6 +153,14 @@ async def ping(ctx):
 bot.add_listener(on_command_error, 'on_command_error')
 bot.add_listener(on_error, 'on_error')
 
+# Event-driven caches: listing member index, member counters, ban lists
+member_index.register(bot)
+counters.register(bot)
+ban_cache.register(bot)
+recent_messages.register(bot)
+first_message.register(bot)
+mute_role.register(bot)
+
 # Loading the command externally
 bot.add_command(help_command)
 bot.add_command(translate)
@@ -133,10 +168,46 @@ bot.add_command(translate)
 
 async def main():
     async with bot:
-        bot.custom_prefixes = load_all_prefixes()
-        print(f"Loaded {len(bot.custom_prefixes)} custom prefixes at startup")
-
+        # Prefixes are loaded on demand; see db/prefix_cache.py
+        bot.custom_prefixes = PrefixCache()
+        snapshot = load_snapshot()
+        bot.custom_prefixes.seed(snapshot)
+        print(f"Loaded {len(snapshot)} prefixes from the local snapshot")
+        snapshot_writer = SnapshotWriter(bot.custom_prefixes)
+        bot.custom_prefixes.on_change = snapshot_writer.mark_dirty
+        if snapshot:
+            asyncio.create_task(reconcile(bot.custom_prefixes, list(snapshot)))
+
+        # Hear about prefix changes made by other bot processes
+        bot.invalidation_bus = make_bus()
+        bot.invalidation_bus.subscribe("prefix", bot.custom_prefixes.refresh)
+        await bot.invalidation_bus.start()
+
+        # Timed actions (mute expiry, ...); command modules register their handlers in setup()
+        bot.scheduler = Scheduler(bot)
         await load_commands_from_folder("commands")
-        await bot.start(token)
-
-asyncio.run(main())
+        bot.scheduler.start()
+        # Mass role jobs left running by a previous process resume once the guilds are ready
+        bot.role_jobs = RoleJobs(bot)
+        bot.role_jobs.start()
+        asyncio.create_task(warnings_db.ensure_indexes())
+        asyncio.create_task(autotranslate.load_channels())
+        asyncio.create_task(first_message.load(bot))
+        # Load language profiles now rather than on the first translate
+        language_detector.warm_up()
+        metrics_runner = await metrics.start(bot)
+        if cluster.CLUSTER_ID is not None:
+            asyncio.create_task(cluster.publish_stats(bot))
+        try:
+            await bot.start(token)
+        finally:
+            await write_buffer.drain()
+            await snapshot_writer.close()
+            await bot.invalidation_bus.close()
+            await bot.scheduler.close()
+            await bot.role_jobs.close()
+            if metrics_runner is not None:
+                await metrics_runner.cleanup()
+
+if __name__ == "__main__":
+    asyncio.run(main())